@@ -0,0 +1 @@
+"""Benchmarks for the music hot paths (run with python -m benchmarks.<name>)"""
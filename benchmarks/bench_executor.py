@@ -0,0 +1,110 @@
+"""Compare thread and process yt-dlp extraction backends
+
+Runs real extractions against YouTube, so it needs network access:
+
+    python -m benchmarks.bench_executor --workers 4 --jobs 32
+
+Prints one JSON object per mode with throughput, latency percentiles and
+event-loop lag (how long the loop was stalled while extractions ran).
+"""
+import argparse
+import asyncio
+import concurrent.futures
+import json
+import multiprocessing
+import os
+import statistics
+import time
+from core import ytdl_worker
+from core.ytdl_pool import YTDLPool
+from core.ytdl_source import YTDLSource
+
+DEFAULT_URLS = [
+    'https://www.youtube.com/watch?v=dQw4w9WgXcQ',
+    'https://www.youtube.com/watch?v=9bZkp7q19f0',
+    'https://www.youtube.com/watch?v=kJQP7kiw5Fk',
+    'https://www.youtube.com/watch?v=JGwWNGJdvx8',
+]
+
+def _percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+async def _measure_lag(stop: asyncio.Event, lags: list[float], interval: float = 0.01) -> None:
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        start = loop.time()
+        await asyncio.sleep(interval)
+        lags.append(loop.time() - start - interval)
+
+async def _run(mode: str, urls: list[str], jobs: int, workers: int) -> dict:
+    loop = asyncio.get_running_loop()
+    options = YTDLSource.ytdl_options
+    if mode == 'process':
+        executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=ytdl_worker.init_worker,
+            initargs=(options, 1000)
+        )
+        # Spawn workers before timing
+        await asyncio.gather(*(loop.run_in_executor(executor, int) for _ in range(workers)))
+        call = ytdl_worker.extract
+    else:
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+        pool = YTDLPool(options, size=workers, max_uses=1000)
+        pool.warm_up()
+        call = lambda url: ytdl_worker.compact_info(pool.extract_info(url, download=False))
+
+    latencies: list[float] = []
+    failures = 0
+
+    async def one(url: str) -> None:
+        nonlocal failures
+        start = time.perf_counter()
+        try:
+            await loop.run_in_executor(executor, call, url)
+        except Exception:
+            failures += 1
+            return
+        latencies.append(time.perf_counter() - start)
+
+    stop = asyncio.Event()
+    lags: list[float] = []
+    lag_task = asyncio.create_task(_measure_lag(stop, lags))
+    start = time.perf_counter()
+    await asyncio.gather(*(one(urls[i % len(urls)]) for i in range(jobs)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await lag_task
+    executor.shutdown()
+
+    return {
+        'mode': mode,
+        'workers': workers,
+        'jobs': jobs,
+        'failures': failures,
+        'cpus': os.cpu_count(),
+        'elapsed_s': round(elapsed, 3),
+        'jobs_per_s': round(len(latencies) / elapsed, 3) if elapsed else 0.0,
+        'latency_p50_s': round(statistics.median(latencies), 3) if latencies else None,
+        'latency_p95_s': round(_percentile(latencies, 0.95), 3) if latencies else None,
+        'loop_lag_max_ms': round(max(lags) * 1000, 1) if lags else 0.0,
+        'loop_lag_p95_ms': round(_percentile(lags, 0.95) * 1000, 1) if lags else 0.0,
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--mode', choices=('thread', 'process', 'both'), default='both')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 4)
+    parser.add_argument('--jobs', type=int, default=32)
+    parser.add_argument('--url', action='append', dest='urls', help='video URL (repeatable)')
+    args = parser.parse_args()
+
+    modes = ('thread', 'process') if args.mode == 'both' else (args.mode,)
+    for mode in modes:
+        result = asyncio.run(_run(mode, args.urls or DEFAULT_URLS, args.jobs, args.workers))
+        print(json.dumps(result))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,278 @@
+"""Offline micro-benchmarks for the music hot paths
+
+Uses fake yt-dlp extractors, a fake VoiceClient and a local Spotify API stub,
+so no network access or Discord connection is needed:
+
+    python -m benchmarks.bench_hotpaths --output results.json
+    python -m benchmarks.bench_hotpaths --baseline results.json --tolerance 0.25
+
+Prints one JSON object per case (timings in microseconds). With --baseline,
+cases whose median got slower than the tolerance allows are reported and the
+exit code is 1, so it can gate a release.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import statistics
+import sys
+import time
+from typing import Any, Awaitable, Callable, Optional
+from config.settings import Config
+
+# Keep the cog and source modules away from real credentials and disk state
+Config.SPOTIFY_CLIENT_ID = None
+Config.SPOTIFY_CLIENT_SECRET = None
+Config.YTDL_EXECUTOR_MODE = 'thread'
+Config.QUEUE_STORE_PATH = ''
+Config.RESOLUTION_CACHE_PATH = ''
+Config.PREFETCH_COUNT = 0
+
+from benchmarks.fakes import (
+    FakeChannel, FakeClient, FakeContext, FakeGuild, FakeVoiceClient,
+    FakeYoutubeDL, FakeYTDLPool, SpotifyStub, flat_entry, full_info,
+)
+from core.embed_builder import EmbedBuilder
+from core.music_player import MusicQueue
+from core.track import Track
+from core.track_list import TrackList
+from core.ytdl_source import TrackSource, YTDLSource
+
+QUEUE_SIZES = (10, 100, 10_000)
+
+def _summary(name: str, size: int, samples: list[float]) -> dict[str, Any]:
+    ordered = sorted(samples)
+    return {
+        'bench': name,
+        'size': size,
+        'runs': len(samples),
+        'min_us': round(ordered[0] * 1e6, 2),
+        'p50_us': round(statistics.median(ordered) * 1e6, 2),
+        'p95_us': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1e6, 2),
+        'mean_us': round(statistics.fmean(ordered) * 1e6, 2),
+    }
+
+async def _time(
+    func: Callable[[Any], Awaitable[Any]],
+    runs: int,
+    setup: Optional[Callable[[], Any]] = None
+) -> list[float]:
+    """Time func(state) runs times; setup() builds fresh state outside the timed region"""
+    samples = []
+    for _ in range(runs):
+        state = setup() if setup else None
+        start = time.perf_counter()
+        await func(state)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+def _tracks(count: int) -> list[Track]:
+    tracks = [Track.from_info(flat_entry(i)) for i in range(count)]
+    for i, track in enumerate(tracks):
+        track.requester_id = i % 7
+        track.channel_id = 1
+    return tracks
+
+def _filled_queue(tracks: list[Track]) -> MusicQueue:
+    queue = MusicQueue(1)
+    queue.queue.extend(tracks)
+    return queue
+
+async def bench_search(runs: int) -> list[dict[str, Any]]:
+    """YTDLSource._search_youtube entry parsing for searches and playlists"""
+    loop = asyncio.get_running_loop()
+    results = []
+    original_pool = YTDLSource.ytdl_pool
+    original_max = Config.PLAYLIST_MAX
+    try:
+        for size in (1, 100, 1000):
+            ydl = FakeYoutubeDL(playlist_size=size)
+            YTDLSource.ytdl_pool = FakeYTDLPool(ydl)
+            Config.PLAYLIST_MAX = size
+            query = 'some artist - some song' if size == 1 else 'https://www.youtube.com/playlist?list=PLbench'
+
+            async def search(_: Any) -> None:
+                tracks, _errors = await YTDLSource._search_youtube(query, loop)
+                assert len(tracks) == size
+
+            results.append(_summary('search_youtube', size, await _time(search, runs)))
+    finally:
+        YTDLSource.ytdl_pool = original_pool
+        Config.PLAYLIST_MAX = original_max
+    return results
+
+async def bench_queue(runs: int) -> list[dict[str, Any]]:
+    """MusicQueue operations at several queue lengths"""
+    results = []
+    for size in QUEUE_SIZES:
+        tracks = _tracks(size)
+        extra = _tracks(10)
+        cases = {
+            'queue_enqueue_10': lambda q: q.enqueue(extra),
+            'queue_dequeue': lambda q: q.dequeue(),
+            'queue_remove_middle': lambda q: q.remove(len(q.queue) // 2),
+            'queue_insert_middle': lambda q: q.insert(len(q.queue) // 2, extra[:1]),
+            'queue_move_end_to_front': lambda q: q.move(len(q.queue) - 1, 0),
+            'queue_jump_half': lambda q: q.jump(len(q.queue) // 2),
+            'queue_shuffle': lambda q: q.shuffle(),
+        }
+        for name, op in cases.items():
+            samples = await _time(op, runs, setup=lambda: _filled_queue(tracks))
+            results.append(_summary(name, size, samples))
+
+        queue = _filled_queue(tracks)
+
+        async def view(_: Any) -> None:
+            queue.queue.view(size // 2, size // 2 + 10)
+
+        results.append(_summary('queue_view_page', size, await _time(view, runs)))
+    return results
+
+async def bench_embed(runs: int) -> list[dict[str, Any]]:
+    """EmbedBuilder.queue_list rendering, fresh and from the page cache"""
+    results = []
+    for size in QUEUE_SIZES:
+        tracks = TrackList(_tracks(size))
+        middle = EmbedBuilder.queue_pages(tracks) // 2
+
+        async def render(_: Any) -> None:
+            EmbedBuilder._queue_page(tracks, '🎧 Queue', middle)
+
+        async def cached(_: Any) -> None:
+            EmbedBuilder.queue_list(tracks, page=middle)
+
+        results.append(_summary('embed_queue_list', size, await _time(render, runs)))
+        results.append(_summary('embed_queue_list_cached', size, await _time(cached, runs)))
+    return results
+
+async def bench_spotify(runs: int) -> list[dict[str, Any]]:
+    """SpotifyHandler playlist resolution against a local API stub"""
+    from core.spotify_handler import SpotifyHandler
+    results = []
+    stub = SpotifyStub()
+    base_url = await stub.start()
+    original = (Config.SPOTIFY_CLIENT_ID, Config.SPOTIFY_CLIENT_SECRET, Config.SPOTIFY_API_URL, Config.SPOTIFY_TOKEN_URL)
+    original_max = Config.PLAYLIST_MAX
+    Config.SPOTIFY_CLIENT_ID, Config.SPOTIFY_CLIENT_SECRET = 'bench', 'bench'
+    Config.SPOTIFY_API_URL, Config.SPOTIFY_TOKEN_URL = f'{base_url}/v1', f'{base_url}/token'
+    handler = SpotifyHandler()
+    try:
+        for size in (100, 500):
+            stub.playlist_size = size
+            Config.PLAYLIST_MAX = size
+            url = 'https://open.spotify.com/playlist/benchplaylist'
+
+            async def resolve(_: Any) -> None:
+                entries = await handler.resolve_entries(url)
+                assert len(entries) == size
+
+            results.append(_summary('spotify_resolve_playlist', size, await _time(resolve, runs)))
+    finally:
+        await handler.close()
+        await stub.stop()
+        Config.SPOTIFY_CLIENT_ID, Config.SPOTIFY_CLIENT_SECRET, Config.SPOTIFY_API_URL, Config.SPOTIFY_TOKEN_URL = original
+        Config.PLAYLIST_MAX = original_max
+    return results
+
+class _BenchSource(TrackSource):
+    """Playable stand-in that skips FFmpeg"""
+
+    def __init__(self, track: Track, stream: dict[str, Any]):
+        self._init_track(track, stream, None)
+
+    def cleanup(self) -> None:
+        pass
+
+async def bench_play_next(runs: int) -> list[dict[str, Any]]:
+    """Track-transition latency: play_next() until VoiceClient.play() is called"""
+    from cogs.music import Music
+    original = (YTDLSource.__dict__['resolve'], YTDLSource.__dict__['from_data'])
+
+    async def resolve(track: Track, *, loop=None) -> dict[str, Any]:
+        info = full_info(0)
+        return {'url': info['url'], 'acodec': info['acodec'], 'abr': info['abr']}
+
+    def from_data(track: Track, stream: dict[str, Any], **kwargs: Any) -> TrackSource:
+        return _BenchSource(track, stream)
+
+    YTDLSource.resolve = staticmethod(resolve)
+    YTDLSource.from_data = staticmethod(from_data)
+    results = []
+    try:
+        for size in (10, 10_000):
+            channel = FakeChannel()
+            voice = FakeVoiceClient()
+            ctx = FakeContext(FakeGuild(), channel, voice)
+            cog = Music(FakeClient(channel))
+            queue = cog.player.get_queue(ctx.guild.id)
+            await queue.enqueue(_tracks(size))
+
+            async def transition(_: Any) -> None:
+                voice.finish()
+                await cog.play_next(ctx)
+                assert voice.is_playing()
+
+            results.append(_summary('play_next_transition', size, await _time(transition, min(runs, size))))
+    finally:
+        YTDLSource.resolve, YTDLSource.from_data = original
+    return results
+
+BENCHES = {
+    'search': bench_search,
+    'queue': bench_queue,
+    'embed': bench_embed,
+    'spotify': bench_spotify,
+    'play_next': bench_play_next,
+}
+
+def _regressions(results: list[dict[str, Any]], baseline_path: str, tolerance: float) -> list[str]:
+    with open(baseline_path) as f:
+        baseline = {(r['bench'], r['size']): r for r in json.load(f)['results']}
+    slower = []
+    for result in results:
+        before = baseline.get((result['bench'], result['size']))
+        if before and result['p50_us'] > before['p50_us'] * (1 + tolerance):
+            slower.append(
+                f"{result['bench']}[{result['size']}]: p50 {before['p50_us']}us -> {result['p50_us']}us"
+            )
+    return slower
+
+async def _run(selected: list[str], runs: int) -> list[dict[str, Any]]:
+    results = []
+    for name in selected:
+        results.extend(await BENCHES[name](runs))
+    return results
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--bench', action='append', choices=sorted(BENCHES), help='case group to run (repeatable)')
+    parser.add_argument('--runs', type=int, default=50)
+    parser.add_argument('--output', help='write all results to this JSON file')
+    parser.add_argument('--baseline', help='compare against a previous --output file')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='allowed p50 slowdown ratio')
+    args = parser.parse_args()
+
+    logging.getLogger("musicbot").setLevel(logging.WARNING)
+    results = asyncio.run(_run(args.bench or list(BENCHES), args.runs))
+    for result in results:
+        print(json.dumps(result))
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'timestamp': time.time(),
+                'results': results,
+            }, f, indent=2)
+
+    if args.baseline:
+        slower = _regressions(results, args.baseline, args.tolerance)
+        for line in slower:
+            print(f'REGRESSION {line}', file=sys.stderr)
+        if slower:
+            sys.exit(1)
+
+if __name__ == '__main__':
+    main()
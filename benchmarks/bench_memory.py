@@ -0,0 +1,65 @@
+"""Compare queue memory for raw yt-dlp info dicts and compact Track records
+
+Builds synthetic entries shaped like real yt-dlp output (flat playlist
+entries for queued tracks, a full info dict with formats and HTTP headers
+for the one playing) and queues them across several guilds, so it runs
+offline:
+
+    python -m benchmarks.bench_memory --guilds 50 --tracks 200 --unique 2000
+
+Prints one JSON object per representation with allocated bytes.
+"""
+import argparse
+import gc
+import json
+import random
+import tracemalloc
+from typing import Any, Callable
+from core.track import Track
+from benchmarks.fakes import flat_entry, full_info
+
+def _measure(build: Callable[[], list[list[Any]]]) -> int:
+    gc.collect()
+    tracemalloc.start()
+    queues = build()
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del queues
+    return size
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--guilds', type=int, default=50)
+    parser.add_argument('--tracks', type=int, default=200, help='queued tracks per guild')
+    parser.add_argument('--unique', type=int, default=2000, help='distinct videos across all guilds')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    picks = [[rng.randrange(args.unique) for _ in range(args.tracks)] for _ in range(args.guilds)]
+
+    # Before: queued tracks were copies of the flat search/playlist entry; only
+    # the now-playing track kept its full extracted info dict
+    raw = _measure(lambda: [
+        [full_info(guild[0])] + [dict(flat_entry(i)) for i in guild[1:]] for guild in picks
+    ])
+    # After: queue entries share one interned record per video
+    compact = _measure(lambda: [
+        [Track.from_info(full_info(guild[0]))] + [Track.from_info(flat_entry(i)) for i in guild[1:]]
+        for guild in picks
+    ])
+
+    total = args.guilds * args.tracks
+    for name, size in (('raw_info', raw), ('compact_track', compact)):
+        print(json.dumps({
+            'representation': name,
+            'guilds': args.guilds,
+            'queued_tracks': total,
+            'unique_videos': args.unique,
+            'bytes': size,
+            'bytes_per_track': round(size / total, 1) if total else 0.0,
+        }))
+
+if __name__ == '__main__':
+    main()
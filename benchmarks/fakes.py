@@ -0,0 +1,239 @@
+"""Offline stand-ins for yt-dlp, Discord voice and the Spotify Web API
+
+Info dicts mirror the shape of real yt-dlp output (flat playlist entries and
+fully extracted videos) so parsing code does the same work it does live.
+"""
+import asyncio
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
+from aiohttp import web
+
+def flat_entry(index: int) -> dict[str, Any]:
+    """A flat playlist/search entry as returned with process=False"""
+    video_id = f'vid{index:08d}'
+    return {
+        '_type': 'url',
+        'ie_key': 'Youtube',
+        'id': video_id,
+        'url': f'https://www.youtube.com/watch?v={video_id}',
+        'title': f'Synthetic track {index}',
+        'description': None,
+        'duration': 180 + index % 240,
+        'channel_id': f'UC{index % 50:022d}',
+        'channel': f'Channel {index % 50}',
+        'channel_url': f'https://www.youtube.com/channel/UC{index % 50:022d}',
+        'uploader': f'Channel {index % 50}',
+        'thumbnails': [
+            {'url': f'https://i.ytimg.com/vi/{video_id}/{size}.jpg', 'height': height, 'width': height * 16 // 9}
+            for size, height in (('default', 90), ('mqdefault', 180), ('hqdefault', 360), ('sddefault', 480))
+        ],
+        'view_count': index * 1000,
+        'live_status': None,
+    }
+
+def full_info(index: int) -> dict[str, Any]:
+    """A fully extracted video with formats, headers and thumbnails"""
+    video_id = f'vid{index:08d}'
+    headers = {
+        'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36',
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+        'Accept-Language': 'en-us,en;q=0.5',
+        'Sec-Fetch-Mode': 'navigate',
+    }
+    formats = [
+        {
+            'format_id': str(200 + n),
+            'url': f'https://rr{n}---sn-example.googlevideo.com/videoplayback?id={video_id}&itag={200 + n}&expire=1700000000',
+            'ext': 'webm' if n % 2 else 'm4a',
+            'acodec': 'opus' if n % 2 else 'mp4a.40.2',
+            'vcodec': 'none',
+            'abr': 48 + n * 16,
+            'asr': 48000,
+            'filesize': 1_000_000 + n * 1000,
+            'http_headers': dict(headers),
+            'downloader_options': {'http_chunk_size': 10485760},
+        }
+        for n in range(20)
+    ]
+    return {
+        'id': video_id,
+        'title': f'Synthetic track {index}',
+        'duration': 180 + index % 240,
+        'uploader': f'Channel {index % 50}',
+        'uploader_url': f'https://www.youtube.com/@channel{index % 50}',
+        'webpage_url': f'https://www.youtube.com/watch?v={video_id}',
+        'thumbnail': f'https://i.ytimg.com/vi/{video_id}/maxresdefault.jpg',
+        'thumbnails': [
+            {'url': f'https://i.ytimg.com/vi/{video_id}/{size}.jpg', 'preference': -n}
+            for n, size in enumerate(('default', 'mqdefault', 'hqdefault', 'sddefault', 'maxresdefault'))
+        ],
+        'description': 'Lorem ipsum dolor sit amet. ' * 20,
+        'tags': [f'tag{n}' for n in range(15)],
+        'formats': formats,
+        'url': formats[-1]['url'],
+        'acodec': formats[-1]['acodec'],
+        'abr': formats[-1]['abr'],
+        'http_headers': headers,
+    }
+
+class FakeYoutubeDL:
+    """Answers extract_info from generated entries; playlists yield lazily like yt-dlp"""
+
+    def __init__(self, playlist_size: int = 100):
+        self.playlist_size = playlist_size
+        self.calls = 0
+
+    def extract_info(self, url: str, download: bool = False, process: bool = True) -> dict[str, Any]:
+        self.calls += 1
+        if url.startswith('ytsearch'):
+            return {'_type': 'playlist', 'id': url, 'entries': iter([flat_entry(self.calls)])}
+        if 'list=' in url:
+            return {
+                '_type': 'playlist',
+                'id': 'PLbench',
+                'title': 'Benchmark playlist',
+                'entries': (flat_entry(i) for i in range(self.playlist_size)),
+            }
+        return full_info(self.calls)
+
+    def close(self) -> None:
+        pass
+
+class _Pooled:
+    __slots__ = ('ydl', 'uses')
+
+    def __init__(self, ydl: FakeYoutubeDL):
+        self.ydl = ydl
+        self.uses = 0
+
+class FakeYTDLPool:
+    """Drop-in for YTDLPool backed by one FakeYoutubeDL"""
+
+    def __init__(self, ydl: FakeYoutubeDL):
+        self.ydl = ydl
+
+    def warm_up(self) -> None:
+        pass
+
+    def acquire(self) -> _Pooled:
+        return _Pooled(self.ydl)
+
+    def release(self, pooled: _Pooled) -> None:
+        pass
+
+    @contextmanager
+    def checkout(self) -> Iterator[FakeYoutubeDL]:
+        yield self.ydl
+
+    def extract_info(self, url: str, **kwargs: Any) -> Any:
+        return self.ydl.extract_info(url, **kwargs)
+
+    def stats(self) -> dict[str, int]:
+        return {'idle': 1, 'created': 1, 'recycled': 0}
+
+class FakeVoiceClient:
+    """Records play() calls; a track 'ends' when finish() is called"""
+
+    def __init__(self):
+        self.source: Any = None
+        self.played = 0
+        self._playing = False
+
+    def play(self, source: Any, *, after=None) -> None:
+        self.source = source
+        self.played += 1
+        self._playing = True
+
+    def finish(self) -> None:
+        self._playing = False
+
+    def stop(self) -> None:
+        self.finish()
+
+    def is_playing(self) -> bool:
+        return self._playing
+
+    def is_paused(self) -> bool:
+        return False
+
+class FakeChannel:
+    def __init__(self, channel_id: int = 1):
+        self.id = channel_id
+        self.sent = 0
+
+    async def send(self, *args: Any, **kwargs: Any) -> None:
+        self.sent += 1
+
+class FakeGuild:
+    def __init__(self, guild_id: int = 1):
+        self.id = guild_id
+
+    def get_member(self, user_id: int) -> None:
+        return None
+
+class FakeClient:
+    """The parts of commands.Bot the music cog touches"""
+
+    def __init__(self, channel: FakeChannel):
+        self.channel = channel
+        self.user = object()
+        self.voice_clients: list[FakeVoiceClient] = []
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        return asyncio.get_running_loop()
+
+    def get_channel(self, channel_id: int) -> Optional[FakeChannel]:
+        return self.channel if channel_id == self.channel.id else None
+
+    def get_user(self, user_id: int) -> None:
+        return None
+
+class FakeContext:
+    def __init__(self, guild: FakeGuild, channel: FakeChannel, voice: FakeVoiceClient):
+        self.guild = guild
+        self.channel = channel
+        self.voice_client = voice
+
+    async def send(self, *args: Any, **kwargs: Any) -> None:
+        await self.channel.send(*args, **kwargs)
+
+class SpotifyStub:
+    """Local Spotify Web API stub (token and playlist endpoints) on an ephemeral port"""
+
+    def __init__(self, playlist_size: int = 500):
+        self.playlist_size = playlist_size
+        self.requests = 0
+        self._runner: Optional[web.AppRunner] = None
+        self.base_url = ''
+
+    @staticmethod
+    def _track(index: int) -> dict[str, Any]:
+        return {'id': f'sp{index:08d}', 'name': f'Song {index}', 'artists': [{'name': f'Artist {index % 40}'}]}
+
+    async def _token(self, request: web.Request) -> web.Response:
+        return web.json_response({'access_token': 'bench', 'token_type': 'Bearer', 'expires_in': 3600})
+
+    async def _playlist_tracks(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        offset = int(request.query.get('offset', 0))
+        limit = int(request.query.get('limit', 100))
+        stop = min(offset + limit, self.playlist_size)
+        items = [{'track': self._track(i)} for i in range(offset, stop)]
+        return web.json_response({'total': self.playlist_size, 'items': items})
+
+    async def start(self) -> str:
+        app = web.Application()
+        app.router.add_post('/token', self._token)
+        app.router.add_get('/v1/playlists/{playlist_id}/tracks', self._playlist_tracks)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.base_url = f'http://127.0.0.1:{port}'
+        return self.base_url
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
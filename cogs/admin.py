@@ -4,6 +4,7 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 from config.settings import Config
+from core.ytdl_source import YTDLSource
 
 
 class Admin(commands.Cog, name='admin'):    
@@ -40,6 +41,21 @@ class Admin(commands.Cog, name='admin'):
         servers_str = ', '.join([server.name for server in servers])
         await ctx.send(f'🎧 **Servers ({len(servers)}):** {servers_str}', ephemeral=True)
 
+    @commands.hybrid_command(name='cachestats', hidden=True, help='Show resolution cache statistics')
+    @commands.is_owner()
+    async def cachestats(self, ctx: commands.Context) -> None:
+        """Show cache hit/miss/eviction counters"""
+        embed = discord.Embed(title='🗄️ Cache Stats', color=discord.Color.blurple())
+        for name, stats in YTDLSource.cache_stats().items():
+            embed.add_field(
+                name=name.title(),
+                value='\n'.join(
+                    f'{key}: {value:.1%}' if key.endswith('_ratio') else f'{key}: {value}'
+                    for key, value in stats.items()
+                )
+            )
+        await ctx.send(embed=embed, ephemeral=True)
+
 async def setup(client: commands.Bot) -> None:
     """Setup function for cog"""
     await client.add_cog(Admin(client))
\ No newline at end of file
@@ -2,29 +2,156 @@
 
 import asyncio
 import logging
-from typing import Optional
+import time
+from typing import Callable, Optional
 import discord
 from discord.ext import commands
 
-from core.ytdl_source import YTDLSource, Track
-from core.music_player import MusicPlayer
+from core.ytdl_source import AUDIO_MODES, TrackSource, YTDLSource, Track
+from core.gapless_source import GaplessSource
+from core.music_player import MusicPlayer, MusicQueue
+from core.queue_store import QueueStore
 from core.embed_builder import EmbedBuilder
+from core.queue_view import QueueView
+from core.metrics import REGISTRY
+from core.scheduler import current_guild
+from core.lifecycle import TimerWheel
 from utils.errors import YTDLError
 from config.settings import Config
 
 logger = logging.getLogger("musicbot")
 
+# Seconds between playlist import progress updates
+PROGRESS_INTERVAL = 3
+# Restarts of one track after its stream was cut off before giving up on it
+MAX_RESUMES = 3
+# Default step for forward/rewind, in seconds
+SEEK_STEP = 10
+# Seconds after a seek before the replaced source is cleaned up, so the voice
+# thread is never in the middle of reading from it
+SEEK_CLEANUP_DELAY = 1
+
+
+def parse_timestamp(value: str) -> Optional[int]:
+    """Seconds from '1:02:03', '55:00' or '90'; None if it isn't a timestamp"""
+    parts = value.strip().split(':')
+    if len(parts) > 3 or not all(part.isdigit() for part in parts):
+        return None
+    seconds = 0
+    for part in parts:
+        seconds = seconds * 60 + int(part)
+    return seconds
+
+
+def format_timestamp(seconds: int) -> str:
+    """'1:02:03' or '2:03'"""
+    minutes, secs = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f'{hours}:{minutes:02}:{secs:02}' if hours else f'{minutes}:{secs:02}'
+
+_FIRST_AUDIO_SECONDS = REGISTRY.histogram(
+    'musicbot_time_to_first_audio_seconds', 'From !play to audio starting, when the bot was idle'
+)
+_TRACK_GAP_SECONDS = REGISTRY.histogram(
+    'musicbot_track_gap_seconds', 'Silence between one track ending and the next one starting'
+)
+
 
 class Music(commands.Cog):    
     def __init__(self, client: commands.Bot) -> None:
         self.client = client
-        self.player = MusicPlayer()
-        self._disconnect_tasks: dict[int, asyncio.Task] = {}
+        self.store = QueueStore(Config.QUEUE_STORE_PATH, ttl=Config.QUEUE_STORE_TTL)
+        self.player = MusicPlayer(resolver=self._prefetch, store=self.store)
+        # Idle disconnects, idle queue eviction and housekeeping share one timer task
+        self.timers = TimerWheel()
+        self._ingest_tasks: dict[int, set[asyncio.Task]] = {}
+        # Guilds where play_next is currently picking a track
+        self._starting: set[int] = set()
+        # Guilds with a seek resolving its new source; kept apart from _starting so a
+        # track ending meanwhile still moves on to the next one
+        self._seeking: set[int] = set()
+        # perf_counter() at the end of each guild's last track, for the gap metric
+        self._track_ended: dict[int, float] = {}
+        # Gapless mode: the chained source playing in each guild, and next-track preparation
+        self._gapless: dict[int, GaplessSource] = {}
+        self._arming: dict[int, asyncio.Task] = {}
+        # yt-dlp is imported and its pool filled on the first music command, not at startup
+        self._warm_up: Optional[asyncio.Task] = None
+        REGISTRY.gauge(
+            'musicbot_voice_clients', 'Connected voice clients',
+            collector=lambda: [({}, len(self.client.voice_clients))]
+        )
+        REGISTRY.gauge(
+            'musicbot_queue_tracks', 'Queued tracks per guild', ('guild',),
+            collector=lambda: [({'guild': str(gid)}, q.size()) for gid, q in list(self.player.queues.items())]
+        )
+
+    async def cog_load(self) -> None:
+        """Start the timers"""
+        self.timers.start()
+        self.timers.schedule('housekeeping', Config.HOUSEKEEPING_INTERVAL, self._housekeeping)
+
+    async def cog_unload(self) -> None:
+        """Release pooled resources when the cog is unloaded"""
+        await self.timers.stop()
+        if self._warm_up is not None:
+            self._warm_up.cancel()
+        await YTDLSource.close()
+        await self.store.close()
+
+    async def cog_before_invoke(self, ctx: commands.Context) -> None:
+        """Restore the guild's saved queue on first use after a restart"""
+        if self._warm_up is None:
+            self._warm_up = asyncio.create_task(self._warm_up_ytdl())
+        if ctx.guild is not None:
+            # yt-dlp jobs started by this command (and its imports) count against this guild
+            current_guild.set(ctx.guild.id)
+            self._touch(ctx.guild.id)
+            await self.player.restore(ctx.guild.id)
+
+    async def _warm_up_ytdl(self) -> None:
+        """Import yt-dlp and pre-create pooled instances in the background"""
+        start = time.perf_counter()
+        try:
+            await YTDLSource.warm_up()
+        except Exception as e:
+            # Instances are created on demand instead
+            logger.warning(f"yt-dlp warm-up failed: {e}")
+            return
+        logger.info(f"yt-dlp ready after {time.perf_counter() - start:.2f}s")
+
+    async def _prefetch(self, queue: MusicQueue, track: Track):
+        """Look-ahead resolver used by the queue for upcoming tracks"""
+        if Config.PREFETCH_FFMPEG:
+            return await YTDLSource.create_source(
+                track, loop=self.client.loop, audio_mode=queue.audio_mode, volume=queue.volume
+            )
+        return await YTDLSource.resolve(track, loop=self.client.loop)
+
+    async def _get_source(self, queue: MusicQueue, track: Track, prefetched: Optional[asyncio.Task]) -> TrackSource:
+        """Use a prefetched result if there is one, otherwise resolve now"""
+        if prefetched is not None and not prefetched.cancelled():
+            try:
+                result = await prefetched
+            except YTDLError as e:
+                logger.debug(f"Prefetch unusable, resolving again: {e}")
+            else:
+                if not isinstance(result, TrackSource):
+                    return YTDLSource.from_data(track, result, audio_mode=queue.audio_mode, volume=queue.volume)
+                if isinstance(result, YTDLSource) == (queue.audio_mode == 'pcm'):
+                    return result
+                # Playback mode changed since the source was prefetched
+                result.cleanup()
+                return YTDLSource.from_data(result.track, result.stream, audio_mode=queue.audio_mode, volume=queue.volume)
+        return await YTDLSource.create_source(
+            track, loop=self.client.loop, audio_mode=queue.audio_mode, volume=queue.volume
+        )
 
     def make_after_callback(self, ctx: commands.Context):
         """Create callback that schedules async continuation"""
         def callback_wrapper(*args, **kwargs) -> None:
             exc = args[0] if args else kwargs.get('error', None)
+            self._track_ended[ctx.guild.id] = time.perf_counter()
             if exc:
                 logger.error(f'FFmpeg/Player error in guild {ctx.guild.id}: {exc}')
             asyncio.run_coroutine_threadsafe(self._after_play(ctx, exc), self.client.loop)
@@ -32,28 +159,110 @@ class Music(commands.Cog):
 
     async def _after_play(self, ctx: commands.Context, exc: Optional[Exception]) -> None:
         """Async continuation called after track ends"""
+        source = self.player.get_queue(ctx.guild.id).now_playing
+        if isinstance(source, TrackSource) and (source.stream_forbidden or source.interrupted):
+            # Stream URL was refused or ran out; make sure the next play re-resolves it
+            YTDLSource.forget_stream(source.track.id)
+        if isinstance(source, TrackSource) and source.interrupted and await self._resume(ctx, source):
+            return
         if exc:
             await ctx.send(f'⚠️ Playback error: {exc}')
         await self.play_next(ctx)
 
-    async def _schedule_disconnect(
+    async def _resume(self, ctx: commands.Context, source: TrackSource) -> bool:
+        """Restart a track that was cut off mid-way from where it stopped; False if it can't be"""
+        guild_id = ctx.guild.id
+        voice = ctx.voice_client
+        if not voice or source.resumes >= MAX_RESUMES or guild_id in self._starting:
+            return False
+        self._starting.add(guild_id)
+        try:
+            queue = self.player.get_queue(guild_id)
+            position = source.position
+            try:
+                resumed = await YTDLSource.create_source(
+                    source.track,
+                    loop=self.client.loop,
+                    audio_mode=queue.audio_mode,
+                    volume=queue.volume,
+                    start=position
+                )
+            except YTDLError as e:
+                logger.warning(f"Could not resume {source.title} in guild {guild_id}: {e}")
+                return False
+            resumed.resumes = source.resumes + 1
+            # Carry a gapless cue over to the new chain
+            armed = await self._take_armed(guild_id)
+            chained = self._chain(ctx, resumed)
+            if armed is not None:
+                chained.set_next(armed)
+            queue.now_playing = resumed
+            try:
+                voice.play(chained, after=self.make_after_callback(ctx))
+            except Exception as e:
+                logger.exception(f'Resuming playback failed: {e}')
+                resumed.cleanup()
+                return False
+            self._track_ended.pop(guild_id, None)
+            logger.info(f"Resumed {source.title} at {position:.0f}s in guild {guild_id} after its stream was cut off")
+            return True
+        finally:
+            self._starting.discard(guild_id)
+
+    def _schedule_disconnect(
         self, 
         guild_id: int, 
         voice: discord.VoiceClient, 
         delay: Optional[int] = None
     ) -> None:
         """Disconnect if nothing starts playing within delay seconds"""
-        delay = delay or Config.DISCONNECT_TIMEOUT
+        self.timers.schedule(
+            ('disconnect', guild_id),
+            delay or Config.DISCONNECT_TIMEOUT,
+            lambda: self._disconnect_if_idle(guild_id, voice)
+        )
+
+    async def _disconnect_if_idle(self, guild_id: int, voice: discord.VoiceClient) -> None:
+        if voice and not voice.is_playing():
+            queue = self.player.get_queue(guild_id)
+            if queue.size() == 0:
+                await voice.disconnect()
+                self._cancel_ingest(guild_id)
+                self.player.cleanup(guild_id)
+                logger.info(f'Disconnected due to inactivity in guild {guild_id}')
+
+    def _touch(self, guild_id: int) -> None:
+        """Push back eviction of the guild's queue object"""
+        self.timers.schedule(('evict', guild_id), Config.QUEUE_IDLE_TIMEOUT, lambda: self._evict_if_idle(guild_id))
+
+    def _evict_if_idle(self, guild_id: int) -> None:
+        guild = self.client.get_guild(guild_id)
+        busy = (
+            (guild is not None and guild.voice_client is not None)
+            or self._ingest_tasks.get(guild_id)
+            or guild_id in self._starting
+        )
+        if busy:
+            self._touch(guild_id)
+        elif self.player.evict(guild_id):
+            logger.debug(f'Evicted idle queue for guild {guild_id}')
+
+    async def _housekeeping(self) -> None:
+        """Periodic cleanup of expired cache entries and per-guild leftovers"""
         try:
-            await asyncio.sleep(delay)
-            if voice and not voice.is_playing():
-                queue = self.player.get_queue(guild_id)
-                if queue.size() == 0:
-                    await voice.disconnect()
-                    self.player.cleanup(guild_id)
-                    logger.info(f'Disconnected due to inactivity in guild {guild_id}')
-        except asyncio.CancelledError:
-            pass
+            purged = YTDLSource.purge_expired()
+            connected = {voice.guild.id for voice in self.client.voice_clients}
+            for guild_id in [g for g, tasks in self._ingest_tasks.items() if not tasks]:
+                del self._ingest_tasks[guild_id]
+            for state in (self._track_ended, self._gapless):
+                for guild_id in [g for g in state if g not in connected]:
+                    del state[guild_id]
+            logger.debug(
+                f'Housekeeping: purged {purged} expired cache entries; '
+                f'{len(self.player.queues)} queue(s) in memory, {len(self.timers)} timer(s)'
+            )
+        finally:
+            self.timers.schedule('housekeeping', Config.HOUSEKEEPING_INTERVAL, self._housekeeping)
 
     async def voice_check(self, ctx: commands.Context, voice: Optional[discord.VoiceClient]) -> bool:
         """Check if bot and user are in same voice channel"""
@@ -81,8 +290,9 @@ class Music(commands.Cog):
         else:
             await ctx.voice_client.move_to(channel)
 
-        # Initialize queue for guild
-        self.player.get_queue(ctx.guild.id)
+        # Pick up a queue restored after a restart
+        if self.player.get_queue(ctx.guild.id).size():
+            await self._ensure_playing(ctx)
         await ctx.send('👋')
 
     @commands.hybrid_command(name='leave', help='Make the bot leave the voice channel')
@@ -93,11 +303,9 @@ class Music(commands.Cog):
             return
 
         await ctx.voice_client.disconnect()
+        self._cancel_ingest(ctx.guild.id)
         self.player.cleanup(ctx.guild.id)
-        # Cancel disconnect task
-        dt = self._disconnect_tasks.pop(ctx.guild.id, None)
-        if dt and not dt.done():
-            dt.cancel()
+        self.timers.cancel(('disconnect', ctx.guild.id))
         await ctx.send('👋')
 
     @commands.hybrid_command(name='skip', help='Skip the current song')
@@ -153,9 +361,32 @@ class Music(commands.Cog):
             return
 
         queue.repeat_mode = not queue.repeat_mode
+        # The track cued for a gapless handover was picked under the old mode
+        await self._disarm(ctx.guild.id, requeue=True)
         status = 'ON' if queue.repeat_mode else 'OFF'
         await ctx.send(f'🔁 Repeat mode **{status}**')
 
+    @commands.hybrid_command(name='audiomode', help='Switch between PCM and Opus passthrough playback')
+    async def audiomode(self, ctx: commands.Context, mode: Optional[str] = None) -> None:
+        """Show or set the playback path for this server"""
+        voice = ctx.voice_client
+        if not await self.voice_check(ctx, voice):
+            return
+
+        queue = self.player.get_queue(ctx.guild.id)
+        if mode is None:
+            await ctx.send(f'🎚️ Audio mode is **{queue.audio_mode}**')
+            return
+
+        mode = mode.lower()
+        if mode not in AUDIO_MODES:
+            await ctx.send(f'❌ Unknown mode. Use one of: {", ".join(AUDIO_MODES)}')
+            return
+
+        queue.audio_mode = mode
+        await self._disarm(ctx.guild.id, requeue=True)
+        await ctx.send(f'🎚️ Audio mode set to **{mode}** (applies from the next song)')
+
     @commands.hybrid_command(name='shuffle', help='Shuffle the queue')
     async def shuffle(self, ctx: commands.Context) -> None:
         """Shuffle queue"""
@@ -181,6 +412,8 @@ class Music(commands.Cog):
             await ctx.send('❌ Nothing is playing.')
             return
 
+        self._cancel_ingest(ctx.guild.id)
+        await self._disarm(ctx.guild.id, requeue=False)
         voice.stop()
         queue = self.player.get_queue(ctx.guild.id)
         await queue.clear()
@@ -194,6 +427,8 @@ class Music(commands.Cog):
             await ctx.send('❌ Queue is empty.')
             return
 
+        self._cancel_ingest(ctx.guild.id)
+        await self._disarm(ctx.guild.id, requeue=False)
         await queue.clear()
         await ctx.send('🗑️ Cleared the queue.')
 
@@ -216,17 +451,52 @@ class Music(commands.Cog):
             await ctx.send('❌ Failed to remove track.')
 
     @commands.hybrid_command(name='queue', help='Show the current queue')
-    async def queue(self, ctx: commands.Context) -> None:
-        """Display queue"""
+    async def queue(self, ctx: commands.Context, page: int = 1) -> None:
+        """Display queue, one page at a time"""
         queue = self.player.get_queue(ctx.guild.id)
         if queue.size() == 0:
             await ctx.send('❌ Queue is empty.')
             return
 
-        # Convert deque to list for embed builder
-        queue_list = list(queue.queue)
-        embed = EmbedBuilder.queue_list(queue_list)
-        await ctx.send(embed=embed)
+        if EmbedBuilder.queue_pages(queue.queue) == 1:
+            await ctx.send(embed=EmbedBuilder.queue_list(queue.queue))
+            return
+        view = QueueView(queue.queue, page=page - 1)
+        view.message = await ctx.send(embed=view.embed, view=view)
+
+    @commands.hybrid_command(name='move', help='Move a song to another position in the queue')
+    async def move(self, ctx: commands.Context, source: int, destination: int) -> None:
+        """Move track within the queue"""
+        voice = ctx.voice_client
+        if not await self.voice_check(ctx, voice):
+            return
+
+        queue = self.player.get_queue(ctx.guild.id)
+        moved = await queue.move(source - 1, destination - 1)
+        if moved:
+            await ctx.send(f'↕️ **Moved:** {moved.title} to position {destination}')
+        else:
+            await ctx.send('❌ Invalid index.')
+
+    @commands.hybrid_command(name='skipto', help='Skip to a position in the queue', aliases=['jump'])
+    async def skipto(self, ctx: commands.Context, index: int) -> None:
+        """Drop the tracks before index and play it next"""
+        voice = ctx.voice_client
+        if not await self.voice_check(ctx, voice):
+            return
+
+        queue = self.player.get_queue(ctx.guild.id)
+        if index < 1 or index > queue.size():
+            await ctx.send('❌ Invalid index.')
+            return
+
+        await self._disarm(ctx.guild.id, requeue=False)
+        skipped = await queue.jump(index - 1)
+        if voice.is_playing() or voice.is_paused():
+            voice.stop()
+        else:
+            await self._ensure_playing(ctx)
+        await ctx.send(f'⏭️ Skipped {len(skipped)} song(s).')
 
     @commands.hybrid_command(name='nowplaying', help='Show the currently playing song', aliases=['np'])
     async def nowplaying(self, ctx: commands.Context) -> None:
@@ -241,7 +511,7 @@ class Music(commands.Cog):
             return
 
         source = queue.now_playing
-        embed = EmbedBuilder.music_now_playing(source, source.data.get('requester'))
+        embed = EmbedBuilder.music_now_playing(source, self._requester(ctx.guild, source.track))
         await ctx.send(embed=embed)
 
     @commands.hybrid_command(name='play', help='Play a song or playlist from YouTube')
@@ -256,27 +526,106 @@ class Music(commands.Cog):
             await ctx.send('❌ You\'re not in my voice channel.')
             return
 
+        started = time.perf_counter()
         if not voice:
             await ctx.invoke(self.join)
             voice = ctx.voice_client
 
+        stream = YTDLSource.iter_search(song, loop=self.client.loop)
+        tracks: list[Track] = []
+        errors: list[str] = []
+        exhausted = False
         async with ctx.typing():
             try:
-                tracks, errors = await YTDLSource.search(song, loop=self.client.loop)
+                # Only wait for the first playable batch; the rest is ingested in the background
+                async for batch_tracks, batch_errors in stream:
+                    tracks.extend(batch_tracks)
+                    errors.extend(batch_errors)
+                    if tracks:
+                        break
+                else:
+                    exhausted = True
             except YTDLError as e:
                 await ctx.send(f'⚠️ {str(e)}')
                 return
 
-        # Attach requester/channel to each track
-        for track in tracks:
-            track.info['requester'] = ctx.author
-            track.info['channel'] = ctx.channel
-
         # Enqueue tracks
         queue = self.player.get_queue(ctx.guild.id)
+        self._attach_requester(ctx, tracks)
         await queue.enqueue(tracks)
 
-        # Report skipped entries
+        # Cancel the idle disconnect
+        self.timers.cancel(('disconnect', ctx.guild.id))
+
+        # Start playback if idle
+        was_idle = not voice.is_playing()
+        await self._ensure_playing(ctx)
+        if was_idle and voice.is_playing():
+            _FIRST_AUDIO_SECONDS.observe(time.perf_counter() - started)
+
+        if exhausted:
+            await self._report_enqueued(ctx, len(tracks), errors, announce=not was_idle)
+        else:
+            task = asyncio.create_task(self._ingest(ctx, stream, len(tracks), errors, announce=not was_idle))
+            tasks = self._ingest_tasks.setdefault(ctx.guild.id, set())
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+    def _attach_requester(self, ctx: commands.Context, tracks: list[Track]) -> None:
+        """Attach requester/channel to each track"""
+        for track in tracks:
+            track.requester_id = ctx.author.id
+            track.channel_id = ctx.channel.id
+
+    def _requester(self, guild: discord.Guild, track: Track) -> Optional[discord.abc.User]:
+        """Look up who queued a track (tracks only keep the user ID)"""
+        if track.requester_id is None:
+            return None
+        return guild.get_member(track.requester_id) or self.client.get_user(track.requester_id)
+
+    async def _ingest(
+        self,
+        ctx: commands.Context,
+        stream,
+        count: int,
+        errors: list[str],
+        announce: bool
+    ) -> None:
+        """Keep appending streamed search results to the queue, with progress updates"""
+        queue = self.player.get_queue(ctx.guild.id)
+        progress: Optional[discord.Message] = None
+        last_update = self.client.loop.time()
+        try:
+            async for tracks, batch_errors in stream:
+                errors.extend(batch_errors)
+                if not tracks:
+                    continue
+                self._attach_requester(ctx, tracks)
+                await queue.enqueue(tracks)
+                count += len(tracks)
+                # The queue may have run dry while we were still importing
+                await self._ensure_playing(ctx)
+
+                now = self.client.loop.time()
+                if now - last_update >= PROGRESS_INTERVAL:
+                    last_update = now
+                    text = f'⏳ Loading... **{count}** track(s) enqueued so far'
+                    if progress is None:
+                        progress = await ctx.send(text)
+                    else:
+                        await progress.edit(content=text)
+        except YTDLError as e:
+            await ctx.send(f'⚠️ {str(e)}')
+        finally:
+            await stream.aclose()
+
+        if progress is not None:
+            await progress.edit(content=f'🎧 **Enqueued:** {count} track(s)')
+            announce = False
+        await self._report_enqueued(ctx, count, errors, announce=announce or count > 1)
+
+    async def _report_enqueued(self, ctx: commands.Context, count: int, errors: list[str], announce: bool) -> None:
+        """Report skipped entries and the number of enqueued tracks"""
         if errors:
             sample = errors[:5]
             more = len(errors) - len(sample)
@@ -286,63 +635,253 @@ class Music(commands.Cog):
                 msg_lines.append(f'...and {more} more.')
             await ctx.send('\n'.join(msg_lines))
 
-        # Cancel disconnect task
-        dt = self._disconnect_tasks.pop(ctx.guild.id, None)
-        if dt and not dt.done():
-            dt.cancel()
+        if announce:
+            await ctx.send(f'🎧 **Enqueued:** {count} track(s)')
 
-        # Start playback if idle
-        if not voice.is_playing():
-            await self.play_next(ctx)
-        else:
-            await ctx.send(f'🎧 **Enqueued:** {len(tracks)} track(s)')
+    def _cancel_ingest(self, guild_id: int) -> None:
+        """Stop background playlist imports for a guild"""
+        for task in self._ingest_tasks.pop(guild_id, set()):
+            task.cancel()
+
+    @commands.hybrid_command(name='seek', help='Jump to a time in the current song, e.g. 1:30')
+    async def seek(self, ctx: commands.Context, timestamp: str) -> None:
+        """Seek to an absolute position"""
+        position = parse_timestamp(timestamp)
+        if position is None:
+            await ctx.send('❌ Invalid timestamp. Use e.g. `90`, `1:30` or `1:02:03`.')
+            return
+        await self._seek(ctx, lambda source: position)
+
+    @commands.hybrid_command(name='forward', help='Skip ahead in the current song', aliases=['ff'])
+    async def forward(self, ctx: commands.Context, seconds: int = SEEK_STEP) -> None:
+        """Seek forward by seconds"""
+        await self._seek(ctx, lambda source: source.position + seconds)
+
+    @commands.hybrid_command(name='rewind', help='Go back in the current song', aliases=['rw'])
+    async def rewind(self, ctx: commands.Context, seconds: int = SEEK_STEP) -> None:
+        """Seek backward by seconds"""
+        await self._seek(ctx, lambda source: source.position - seconds)
+
+    async def _seek(self, ctx: commands.Context, target: Callable[[TrackSource], float]) -> None:
+        """Restart the current track at target(source) seconds, reusing its stream URL"""
+        voice = ctx.voice_client
+        if not await self.voice_check(ctx, voice):
+            return
+
+        guild_id = ctx.guild.id
+        queue = self.player.get_queue(guild_id)
+        current = queue.now_playing
+        if current is None or not (voice.is_playing() or voice.is_paused()):
+            await ctx.send('❌ Nothing is playing.')
+            return
+        if not current.duration or current.stream.get('is_live'):
+            await ctx.send('❌ Can\'t seek in a live stream.')
+            return
+        if guild_id in self._starting:
+            await ctx.send('❌ The next song is starting, try again in a moment.')
+            return
+        if guild_id in self._seeking:
+            await ctx.send('❌ Already seeking, try again in a moment.')
+            return
+
+        position = min(max(0, int(target(current))), current.duration - 1)
+        emoji = '⏪' if position < current.position else '⏩'
+        self._seeking.add(guild_id)
+        try:
+            try:
+                source = await YTDLSource.seek_source(
+                    current,
+                    position,
+                    loop=self.client.loop,
+                    audio_mode=queue.audio_mode,
+                    volume=queue.volume
+                )
+            except YTDLError as e:
+                await ctx.send(f'❌ Seek failed: {e}')
+                return
+            if queue.now_playing is not current or not (voice.is_playing() or voice.is_paused()):
+                # The track ended or was skipped while the stream was resolved
+                source.cleanup()
+                await ctx.send('❌ The song changed before the seek was ready.')
+                return
+            source.resumes = current.resumes
+            self._swap_source(voice, guild_id, current, source)
+            queue.now_playing = source
+        finally:
+            self._seeking.discard(guild_id)
+        await ctx.send(f'{emoji} Seeked to **{format_timestamp(position)}** / {format_timestamp(source.duration)}')
+
+    def _swap_source(
+        self,
+        voice: discord.VoiceClient,
+        guild_id: int,
+        current: TrackSource,
+        source: TrackSource
+    ) -> None:
+        """Switch the playing source without firing the track-end callback"""
+        wrapper = self._gapless.get(guild_id)
+        if wrapper is not None and voice.source is wrapper:
+            # Swapped on the voice thread between two reads
+            wrapper.replace(source)
+            return
+        paused = voice.is_paused()
+        voice.source = source
+        if paused:
+            # Replacing the source resumes the player
+            voice.pause()
+        self.client.loop.call_later(SEEK_CLEANUP_DELAY, current.cleanup)
+
+    async def _ensure_playing(self, ctx: commands.Context) -> None:
+        """Start playback if the bot is connected and idle"""
+        voice = ctx.voice_client
+        if not voice or voice.is_playing() or voice.is_paused():
+            return
+        await self.play_next(ctx)
 
     async def play_next(self, ctx: commands.Context) -> None:
         """Play next song; skip bad items"""
+        guild_id = ctx.guild.id
+        # Called from the voice thread's callback too, which has no guild context
+        current_guild.set(guild_id)
+        # Track-end callbacks and background imports may both try to start playback
+        if guild_id in self._starting:
+            return
+        self._starting.add(guild_id)
+        try:
+            await self._play_next(ctx)
+        finally:
+            self._starting.discard(guild_id)
+
+    async def _play_next(self, ctx: commands.Context) -> None:
         voice = ctx.voice_client
+        guild_id = ctx.guild.id
+        # A track cued for a gapless handover that didn't happen (skip, or the
+        # previous one ended early) is next in line
+        armed = await self._take_armed(guild_id)
+        self._gapless.pop(guild_id, None)
         if not voice:
+            if armed is not None:
+                armed.cleanup()
             return
 
-        guild_id = ctx.guild.id
         queue = self.player.get_queue(guild_id)
 
+        while True:
+            source = armed or await self._next_source(ctx, queue)
+            armed = None
+            if source is None:
+                queue.now_playing = None
+                self._track_ended.pop(guild_id, None)
+                # Schedule disconnect
+                if ('disconnect', guild_id) not in self.timers:
+                    self._schedule_disconnect(guild_id, voice)
+                return
+
+            # Set now playing
+            queue.now_playing = source
+
+            # Play
+            try:
+                voice.play(self._chain(ctx, source), after=self.make_after_callback(ctx))
+                ended = self._track_ended.pop(guild_id, None)
+                gap = time.perf_counter() - ended if ended is not None else None
+                await self._track_started(ctx, source, gap)
+                return
+            except Exception as e:
+                logger.exception(f'Playback start failed: {e}')
+                continue
+
+    async def _next_source(self, ctx: commands.Context, queue: MusicQueue) -> Optional[TrackSource]:
+        """Take the next track (or the current one on repeat) and make it playable; skip bad items"""
         while True:
             if queue.repeat_mode and queue.now_playing is not None:
-                track = Track(info=dict(queue.now_playing.data))
+                track = queue.now_playing.track
             else:
                 track = await queue.dequeue()
                 if not track:
-                    # Schedule disconnect
-                    if guild_id not in self._disconnect_tasks or self._disconnect_tasks[guild_id].done():
-                        self._disconnect_tasks[guild_id] = asyncio.create_task(
-                            self._schedule_disconnect(guild_id, voice)
-                        )
-                    return
+                    return None
 
             # Try to create playable source
             try:
-                source = await YTDLSource.create_source(track, loop=self.client.loop)
+                return await self._get_source(queue, track, queue.take_prefetched(track))
             except YTDLError as e:
                 logger.warning(f"Failed to create source: {e}")
                 await ctx.send(f'⚠️ Skipped `{track.title}`: {e}')
-                continue
 
-            # Set now playing
-            queue.now_playing = source
+    async def _track_started(self, ctx: commands.Context, source: TrackSource, gap: Optional[float]) -> None:
+        """Bookkeeping and the now playing message for a track that started"""
+        YTDLSource.record_play(source)
+        if gap is not None:
+            _TRACK_GAP_SECONDS.observe(gap)
+        track = source.track
+        channel = self.client.get_channel(track.channel_id) if track.channel_id else None
+        requester = self._requester(ctx.guild, track)
+        if channel:
+            await channel.send(
+                embed=EmbedBuilder.music_now_playing(source, requester)
+            )
+
+    def _chain(self, ctx: commands.Context, source: TrackSource) -> discord.AudioSource:
+        """Wrap the source for in-thread handovers when gapless playback is enabled"""
+        if not Config.GAPLESS:
+            return source
+        loop = self.client.loop
+        wrapper = GaplessSource(
+            source,
+            lead=Config.GAPLESS_LEAD,
+            on_near_end=lambda: loop.call_soon_threadsafe(self._start_arming, ctx, wrapper),
+            on_advance=lambda previous, current: loop.call_soon_threadsafe(self._handed_over, ctx, current)
+        )
+        self._gapless[ctx.guild.id] = wrapper
+        return wrapper
+
+    def _start_arming(self, ctx: commands.Context, wrapper: GaplessSource) -> None:
+        guild_id = ctx.guild.id
+        if self._gapless.get(guild_id) is wrapper and guild_id not in self._arming:
+            self._arming[guild_id] = asyncio.create_task(self._arm(ctx, wrapper))
 
-            # Play
-            try:
-                voice.play(source, after=self.make_after_callback(ctx))
-                channel = source.data.get('channel')
-                requester = source.data.get('requester')
-                if channel:
-                    await channel.send(
-                        embed=EmbedBuilder.music_now_playing(source, requester)
-                    )
-                return
-            except Exception as e:
-                logger.exception(f'Playback start failed: {e}')
-                continue
+    async def _arm(self, ctx: commands.Context, wrapper: GaplessSource) -> None:
+        """Start FFmpeg for the next track so it is buffered before the current one ends"""
+        current_guild.set(ctx.guild.id)
+        try:
+            source = await self._next_source(ctx, self.player.get_queue(ctx.guild.id))
+            if source is not None:
+                wrapper.set_next(source)
+        except Exception as e:
+            logger.exception(f'Preparing the next track failed: {e}')
+        finally:
+            self._arming.pop(ctx.guild.id, None)
+
+    def _handed_over(self, ctx: commands.Context, source: TrackSource) -> None:
+        self.player.get_queue(ctx.guild.id).now_playing = source
+        # Back to back by construction; counted so the gap histogram covers every transition
+        asyncio.create_task(self._track_started(ctx, source, 0.0))
+
+    async def _take_armed(self, guild_id: int) -> Optional[TrackSource]:
+        """Wait for next-track preparation and take the source it cued, if any"""
+        task = self._arming.get(guild_id)
+        if task is not None:
+            await asyncio.gather(task, return_exceptions=True)
+        wrapper = self._gapless.get(guild_id)
+        return wrapper.take_next() if wrapper is not None else None
+
+    async def _disarm(self, guild_id: int, *, requeue: bool) -> None:
+        """Drop the cued source; requeue puts its track back in front and cues again"""
+        source = await self._take_armed(guild_id)
+        if source is None:
+            return
+        source.cleanup()
+        if not requeue:
+            return
+        queue = self.player.get_queue(guild_id)
+        current = queue.now_playing
+        # On repeat the cued track is the current one, which was never dequeued
+        if current is None or source.track is not current.track:
+            await queue.insert(0, [source.track])
+        wrapper = self._gapless.get(guild_id)
+        if wrapper is not None:
+            # Playback goes on, so cue the right track instead
+            wrapper.rearm()
 
     @commands.Cog.listener()
     async def on_voice_state_update(
@@ -361,6 +900,7 @@ class Music(commands.Cog):
 
         if len(voice.channel.members) == 1:
             await voice.disconnect()
+            self._cancel_ingest(member.guild.id)
             self.player.cleanup(member.guild.id)
 
 
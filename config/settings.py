@@ -8,17 +8,55 @@ class Config:
     BOT_TOKEN = os.getenv("BOT_TOKEN")
     BOT_ID = os.getenv("BOT_ID")
     COMMAND_PREFIX = os.getenv("COMMAND_PREFIX", "!")
+    COMMAND_SYNC_STATE = os.getenv("COMMAND_SYNC_STATE", "data/command_tree.sha256")
     SELF_HOST = os.getenv("SELF_HOST", "true").lower() in ("1", "true", "yes")
     
     # API Keys
     TENOR_TOKEN = os.getenv("TENOR_TOKEN")
     SPOTIFY_CLIENT_ID = os.getenv("SPOTIFY_CLIENT_ID")
     SPOTIFY_CLIENT_SECRET = os.getenv("SPOTIFY_CLIENT_SECRET")
+    SPOTIFY_API_URL = os.getenv("SPOTIFY_API_URL", "https://api.spotify.com/v1")
+    SPOTIFY_TOKEN_URL = os.getenv("SPOTIFY_TOKEN_URL", "https://accounts.spotify.com/api/token")
 
     # Music
     PLAYLIST_MAX = int(os.getenv("PLAYLIST_MAX", "100"))
     YTDL_MAX_WORKERS = int(os.getenv("YTDL_MAX_WORKERS", "4"))
+    YTDL_RECYCLE_AFTER = int(os.getenv("YTDL_RECYCLE_AFTER", "100"))
+    YTDL_EXECUTOR_MODE = os.getenv("YTDL_EXECUTOR_MODE", "thread").lower()
+    YTDL_QUEUE_LIMIT = int(os.getenv("YTDL_QUEUE_LIMIT", "200"))
+    YTDL_GUILD_QUEUE_LIMIT = int(os.getenv("YTDL_GUILD_QUEUE_LIMIT", "50"))
+    SPOTIFY_RESOLVE_CONCURRENCY = int(os.getenv("SPOTIFY_RESOLVE_CONCURRENCY", str(YTDL_MAX_WORKERS)))
+    SPOTIFY_PAGE_CONCURRENCY = int(os.getenv("SPOTIFY_PAGE_CONCURRENCY", "4"))
     DISCONNECT_TIMEOUT = int(os.getenv("DISCONNECT_TIMEOUT", "300"))
+    QUEUE_IDLE_TIMEOUT = int(os.getenv("QUEUE_IDLE_TIMEOUT", "1800"))
+    HOUSEKEEPING_INTERVAL = int(os.getenv("HOUSEKEEPING_INTERVAL", "300"))
+    AUDIO_MODE = os.getenv("AUDIO_MODE", "pcm").lower()
+    AUDIO_VOLUME = float(os.getenv("AUDIO_VOLUME", "0.5"))
+    PREFETCH_COUNT = int(os.getenv("PREFETCH_COUNT", "2"))
+    PREFETCH_FFMPEG = os.getenv("PREFETCH_FFMPEG", "false").lower() in ("1", "true", "yes")
+    GAPLESS = os.getenv("GAPLESS", "false").lower() in ("1", "true", "yes")
+    GAPLESS_LEAD = float(os.getenv("GAPLESS_LEAD", "5"))
+    STREAM_CACHE_SIZE = int(os.getenv("STREAM_CACHE_SIZE", "512"))
+    STREAM_CACHE_TTL = int(os.getenv("STREAM_CACHE_TTL", "18000"))
+    SEARCH_CACHE_SIZE = int(os.getenv("SEARCH_CACHE_SIZE", "2048"))
+    SEARCH_CACHE_TTL = int(os.getenv("SEARCH_CACHE_TTL", "21600"))
+    RESOLUTION_CACHE_PATH = os.getenv("RESOLUTION_CACHE_PATH", "data/resolution_cache.db")
+    RESOLUTION_CACHE_TTL = int(os.getenv("RESOLUTION_CACHE_TTL", "2592000"))
+    RESOLUTION_CACHE_MAX = int(os.getenv("RESOLUTION_CACHE_MAX", "100000"))
+    QUEUE_STORE_PATH = os.getenv("QUEUE_STORE_PATH", "data/queues.db")
+    QUEUE_STORE_TTL = int(os.getenv("QUEUE_STORE_TTL", "604800"))
+    AUDIO_CACHE_DIR = os.getenv("AUDIO_CACHE_DIR", "data/audio")
+    AUDIO_CACHE_MAX_MB = int(os.getenv("AUDIO_CACHE_MAX_MB", "0"))
+    AUDIO_CACHE_MIN_PLAYS = int(os.getenv("AUDIO_CACHE_MIN_PLAYS", "3"))
+    LOUDNESS_NORMALIZE = os.getenv("LOUDNESS_NORMALIZE", "false").lower() in ("1", "true", "yes")
+    LOUDNESS_INDEX_PATH = os.getenv("LOUDNESS_INDEX_PATH", "data/loudness.db")
+    LOUDNESS_TARGET = float(os.getenv("LOUDNESS_TARGET", "-14"))
+    LOUDNESS_MAX_BOOST = float(os.getenv("LOUDNESS_MAX_BOOST", "6"))
+    LOUDNESS_WORKERS = int(os.getenv("LOUDNESS_WORKERS", "1"))
+    
+    # Metrics (Prometheus text format at /metrics; 0 disables)
+    METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))
+    METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
     
     # Logging
     LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
@@ -0,0 +1,203 @@
+"""On-disk cache of Opus audio for frequently played tracks"""
+import asyncio
+import logging
+import os
+import re
+from collections import OrderedDict
+from typing import Any, Optional
+from core.cache import TTLCache
+from core.ffmpeg import run_ffmpeg
+
+logger = logging.getLogger("musicbot")
+
+_SUFFIX = '.ogg'
+# Video IDs become file names, so only accept safe ones
+_ID_RE = re.compile(r'^[\w-]{1,64}$')
+# Don't spend disk (or a download slot) on very long tracks or live streams
+_MAX_DURATION = 30 * 60
+# Plays are counted over this window; a track must reach min_plays within it
+_PLAY_WINDOW = 24 * 60 * 60
+
+class AudioCache:
+    """
+    Byte-bounded LRU directory of Ogg Opus files keyed by video ID. A track is
+    downloaded in the background once it has been played min_plays times, and
+    later plays read the local file instead of streaming from YouTube.
+    """
+
+    def __init__(self, directory: Optional[str], max_bytes: int, min_plays: int, *, bitrate: int = 128):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.min_plays = max(1, min_plays)
+        self.bitrate = bitrate
+        self._files: OrderedDict[str, int] = OrderedDict()  # video ID -> size, least recent first
+        self._total = 0
+        self._loaded = False
+        self._load_lock: Optional[asyncio.Lock] = None
+        self._plays = TTLCache(max_size=10000, ttl=_PLAY_WINDOW)
+        self._downloads: dict[str, asyncio.Task] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.hits = 0
+        self.misses = 0
+        self.stored = 0
+        self.failures = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.directory) and self.max_bytes > 0
+
+    def _path(self, video_id: str) -> str:
+        return os.path.join(self.directory, video_id + _SUFFIX)
+
+    async def load(self) -> None:
+        """Index files left by a previous run (once, on a worker thread)"""
+        if self._loaded or not self.enabled:
+            return
+        if self._load_lock is None:
+            self._load_lock = asyncio.Lock()
+        async with self._load_lock:
+            if self._loaded:
+                return
+            try:
+                found = await asyncio.to_thread(self._scan)
+            except OSError as e:
+                logger.warning(f"Audio cache directory could not be read: {e}")
+                found = []
+            for video_id, size in found:
+                self._files[video_id] = size
+                self._total += size
+            self._loaded = True
+            self._evict()
+
+    def _scan(self) -> list[tuple[str, int]]:
+        """Cached files, oldest access first"""
+        os.makedirs(self.directory, exist_ok=True)
+        found = []
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if entry.name.endswith(_SUFFIX) and entry.is_file():
+                    stat = entry.stat()
+                    found.append((stat.st_mtime, entry.name[:-len(_SUFFIX)], stat.st_size))
+                elif entry.name.endswith('.part'):
+                    # Interrupted download
+                    os.remove(entry.path)
+        return [(video_id, size) for _, video_id, size in sorted(found)]
+
+    def path_for(self, video_id: Optional[str]) -> Optional[str]:
+        """Local file for a video, or None; answered from the in-memory index after load()"""
+        if not self.enabled or not video_id or not self._loaded:
+            return None
+        if video_id not in self._files:
+            self.misses += 1
+            return None
+        path = self._path(video_id)
+        self._files.move_to_end(video_id)
+        self.hits += 1
+        # mtime doubles as the LRU order across restarts
+        loop = asyncio.get_running_loop()
+        loop.run_in_executor(None, self._touch, loop, video_id, path)
+        return path
+
+    def _touch(self, loop: asyncio.AbstractEventLoop, video_id: str, path: str) -> None:
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            # Deleted behind our back; later lookups stream it again
+            loop.call_soon_threadsafe(self._forget, video_id)
+
+    def record_play(self, video_id: Optional[str], stream: dict[str, Any], duration: int) -> None:
+        """Count a play and start caching the track once it is popular enough"""
+        if not self.enabled or not video_id or not _ID_RE.match(video_id):
+            return
+        if stream.get('local') or stream.get('is_live') or not duration or duration > _MAX_DURATION:
+            return
+        plays = (self._plays.get(video_id) or 0) + 1
+        self._plays.put(video_id, plays)
+        if not self._loaded:
+            return
+        if plays < self.min_plays or video_id in self._files or video_id in self._downloads:
+            return
+        task = asyncio.create_task(self._download(video_id, stream['url'], stream.get('acodec'), duration))
+        self._downloads[video_id] = task
+        task.add_done_callback(lambda _: self._downloads.pop(video_id, None))
+
+    async def _download(self, video_id: str, url: str, acodec: Optional[str], duration: int) -> None:
+        if self._semaphore is None:
+            # One download at a time keeps this from competing with live playback
+            self._semaphore = asyncio.Semaphore(1)
+        async with self._semaphore:
+            target = self._path(video_id)
+            part = target + '.part'
+            try:
+                await self._run_ffmpeg(url, acodec, part, timeout=duration + 120)
+                size = await asyncio.to_thread(self._commit, part, target)
+            except asyncio.CancelledError:
+                await asyncio.to_thread(self._remove, part)
+                raise
+            except Exception as e:
+                self.failures += 1
+                await asyncio.to_thread(self._remove, part)
+                logger.warning(f"Audio cache download failed for {video_id}: {e}")
+                return
+            self._files[video_id] = size
+            self._total += size
+            self.stored += 1
+            self._evict()
+            logger.info(f"Cached audio for {video_id} ({size / 1024 / 1024:.1f} MiB)")
+
+    async def _run_ffmpeg(self, url: str, acodec: Optional[str], output: str, timeout: float) -> None:
+        codec = ['-c:a', 'copy'] if acodec == 'opus' else ['-c:a', 'libopus', '-b:a', f'{self.bitrate}k']
+        await run_ffmpeg(
+            '-nostdin', '-loglevel', 'error', '-y',
+            '-reconnect', '1', '-reconnect_streamed', '1', '-reconnect_delay_max', '5',
+            '-i', url, '-map', '0:a:0', '-vn', *codec, '-f', 'ogg', output,
+            timeout=timeout
+        )
+
+    def _evict(self) -> None:
+        while self._total > self.max_bytes and self._files:
+            video_id = next(iter(self._files))
+            self._discard(video_id)
+            self.evictions += 1
+
+    @staticmethod
+    def _commit(part: str, target: str) -> int:
+        os.replace(part, target)
+        return os.path.getsize(target)
+
+    def _forget(self, video_id: str) -> None:
+        self._total -= self._files.pop(video_id, 0)
+
+    def _discard(self, video_id: str) -> None:
+        self._forget(video_id)
+        asyncio.get_running_loop().run_in_executor(None, self._remove, self._path(video_id))
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    async def close(self) -> None:
+        """Stop background downloads (partial files are removed)"""
+        tasks = list(self._downloads.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            'files': len(self._files),
+            'bytes': self._total,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hits / lookups if lookups else 0.0,
+            'stored': self.stored,
+            'failures': self.failures,
+            'evictions': self.evictions,
+            'downloading': len(self._downloads),
+        }
@@ -1,6 +1,12 @@
 """Reusable embed templates"""
+import weakref
 import discord
 
+QUEUE_PAGE_SIZE = 10
+
+# Rendered queue pages per TrackList: (version, {(title, page): embed})
+_QUEUE_PAGES: 'weakref.WeakKeyDictionary' = weakref.WeakKeyDictionary()
+
 class EmbedBuilder:
     @staticmethod
     def music_now_playing(song, requester) -> discord.Embed:
@@ -19,31 +25,58 @@ class EmbedBuilder:
             url=song.url,
             color=discord.Color.blurple()
         )
-        embed.add_field(name='Duration', value=EmbedBuilder._format_duration(duration))
+        position = int(getattr(song, 'position', 0))
+        if position:
+            value = f'{EmbedBuilder._format_duration(position)} / {EmbedBuilder._format_duration(duration)}'
+        else:
+            value = EmbedBuilder._format_duration(duration)
+        embed.add_field(name='Duration', value=value)
         embed.add_field(name='Uploader', value=f'[{song.uploader}]({song.uploader_url})')
         embed.set_thumbnail(url=song.thumbnail)
         embed.set_footer(text=f'Requested by {requester}', icon_url=avatar_url)
         return embed
     
     @staticmethod
-    def queue_list(queue, title='🎧 Queue') -> discord.Embed:
-        """Create queue embed"""
+    def queue_pages(queue) -> int:
+        """Number of queue_list pages for a TrackList"""
+        return max(1, -(-len(queue) // QUEUE_PAGE_SIZE))
+    
+    @staticmethod
+    def queue_list(queue, title='🎧 Queue', page: int = 0) -> discord.Embed:
+        """Create one page of the queue embed from a TrackList"""
         if not queue:
             return discord.Embed(title=title, description='Queue is empty', color=discord.Color.blurple())
         
-        titles = [f'**{i}.** {track.title}' for i, track in enumerate(queue, 1)]
-        total_duration = sum(int(track.duration) if track.duration else 0 for track in queue)
+        page = min(max(0, page), EmbedBuilder.queue_pages(queue) - 1)
+        version, pages = _QUEUE_PAGES.get(queue, (None, None))
+        if version != queue.version:
+            # Any change to the queue invalidates every rendered page
+            pages = {}
+            _QUEUE_PAGES[queue] = (queue.version, pages)
+        embed = pages.get((title, page))
+        if embed is None:
+            embed = pages[(title, page)] = EmbedBuilder._queue_page(queue, title, page)
+        return embed
+    
+    @staticmethod
+    def _queue_page(queue, title: str, page: int) -> discord.Embed:
+        # Only this page's tracks are walked; totals come from the list's running aggregates
+        start = page * QUEUE_PAGE_SIZE
+        tracks = queue.view(start, start + QUEUE_PAGE_SIZE)
+        titles = [f'**{i}.** {track.title}' for i, track in enumerate(tracks, start + 1)]
         
         embed = discord.Embed(
             title=title,
-            description='\n'.join(titles[:10]),
+            description='\n'.join(titles),
             color=discord.Color.blurple()
         )
-        embed.add_field(name='Total Duration', value=EmbedBuilder._format_duration(total_duration))
+        embed.add_field(name='Total Duration', value=EmbedBuilder._format_duration(int(queue.total_duration)))
         
-        if len(titles) > 10:
-            embed.add_field(name='...and more', value=f'{len(titles) - 10} more songs')
+        top = queue.requester_counts.most_common(3)
+        if top:
+            embed.add_field(name='Requested By', value='\n'.join(f'<@{user_id}>: {count}' for user_id, count in top))
         
+        embed.set_footer(text=f'Page {page + 1}/{EmbedBuilder.queue_pages(queue)} · {len(queue)} songs')
         return embed
     
     @staticmethod
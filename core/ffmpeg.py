@@ -0,0 +1,26 @@
+"""Background FFmpeg jobs (caching and analysis, not playback)"""
+import asyncio
+from typing import Callable, Optional
+
+async def run_ffmpeg(*args: str, timeout: float, preexec_fn: Optional[Callable[[], None]] = None) -> bytes:
+    """
+    Run ffmpeg with args to completion and return its stderr. Raises
+    RuntimeError on a non-zero exit; on timeout or cancellation the process
+    is killed rather than left running.
+    """
+    process = await asyncio.create_subprocess_exec(
+        'ffmpeg', *args,
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.PIPE,
+        preexec_fn=preexec_fn
+    )
+    try:
+        _, stderr = await asyncio.wait_for(process.communicate(), timeout=timeout)
+    except BaseException:
+        if process.returncode is None:
+            process.kill()
+            await process.wait()
+        raise
+    if process.returncode != 0:
+        raise RuntimeError(stderr.decode(errors='ignore').strip()[-200:] or f"ffmpeg exited with {process.returncode}")
+    return stderr
@@ -0,0 +1,115 @@
+"""Audio source that hands over to the next track inside the player thread"""
+import logging
+import threading
+from typing import Callable, Optional
+import discord
+from core.ytdl_source import TrackSource
+
+logger = logging.getLogger("musicbot")
+
+class GaplessSource(discord.AudioSource):
+    """
+    Plays a chain of TrackSources as one AudioSource. Shortly before the
+    current track ends, on_near_end() asks for the next source; once set with
+    set_next(), it is switched to on the first empty read, so the voice
+    player never stops between songs and no event loop round trip is needed.
+
+    on_near_end() and on_advance(previous, current) are called from the voice
+    player thread and must not block.
+    """
+
+    def __init__(
+        self,
+        source: TrackSource,
+        *,
+        lead: float,
+        on_near_end: Callable[[], None],
+        on_advance: Callable[[TrackSource, TrackSource], None]
+    ):
+        self.current = source
+        self.lead = lead
+        self.on_near_end = on_near_end
+        self.on_advance = on_advance
+        self._next: Optional[TrackSource] = None
+        self._replacement: Optional[TrackSource] = None
+        self._lock = threading.Lock()
+        self._requested = False
+        self.finished = False
+
+    def is_opus(self) -> bool:
+        # Checked by the player per packet, so PCM and Opus tracks can alternate
+        return self.current.is_opus()
+
+    @property
+    def _current_error(self) -> Optional[Exception]:
+        # Read by the voice player after the last empty read and passed to the after callback;
+        # PCM tracks keep the FFmpeg process (and its error) in the wrapped source
+        source = self.current
+        return getattr(getattr(source, 'original', source), '_current_error', None)
+
+    def set_next(self, source: TrackSource) -> None:
+        """Queue the source to switch to when the current one runs out"""
+        with self._lock:
+            previous, self._next = self._next, source
+        # Already cued; don't ask for another one
+        self._requested = True
+        if previous is not None:
+            previous.cleanup()
+
+    def take_next(self) -> Optional[TrackSource]:
+        """Remove and return the queued source (e.g. after playback was stopped)"""
+        with self._lock:
+            source, self._next = self._next, None
+        return source
+
+    def replace(self, source: TrackSource) -> None:
+        """Switch the current track's source (e.g. after a seek) at the next read"""
+        with self._lock:
+            previous, self._replacement = self._replacement, source
+        if previous is not None:
+            previous.cleanup()
+
+    def rearm(self) -> None:
+        """Ask for the next source again, e.g. after the queued one was dropped"""
+        self._requested = False
+
+    def read(self) -> bytes:
+        if self._replacement is not None:
+            with self._lock:
+                replacement, self._replacement = self._replacement, None
+            # Swapped here, between reads, so the old FFmpeg is never killed mid-read
+            previous, self.current = self.current, replacement
+            previous.cleanup()
+            # The near-end check starts over for the new position
+            if self._next is None:
+                self._requested = False
+        data = self.current.read()
+        if data:
+            duration = self.current.duration
+            if not self._requested and duration and duration - self.current.position <= self.lead:
+                self._requested = True
+                self.on_near_end()
+            return data
+
+        if self.current.interrupted:
+            # Cut off mid-track: stop here so the cog can resume it; the cued source is kept
+            self.finished = True
+            return b''
+        with self._lock:
+            upcoming, self._next = self._next, None
+            if upcoming is None:
+                self.finished = True
+                return b''
+        previous, self.current = self.current, upcoming
+        self._requested = False
+        # FFmpeg has already exited at EOF, so this doesn't block the player
+        previous.cleanup()
+        self.on_advance(previous, upcoming)
+        return upcoming.read()
+
+    def cleanup(self) -> None:
+        # The queued source is left for take_next(); the cog decides whether to play it
+        self.current.cleanup()
+        replacement, self._replacement = self._replacement, None
+        if replacement is not None:
+            replacement.cleanup()
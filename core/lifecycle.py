@@ -0,0 +1,114 @@
+"""Hashed timer wheel for per-guild timeouts and periodic housekeeping"""
+import asyncio
+import inspect
+import logging
+from typing import Any, Callable, Hashable, Optional
+
+logger = logging.getLogger("musicbot")
+
+class _Timer:
+    __slots__ = ('due', 'callback')
+
+    def __init__(self, due: int, callback: Callable[[], Any]):
+        self.due = due
+        self.callback = callback
+
+class TimerWheel:
+    """
+    Keyed timers driven by one asyncio task instead of a sleeping task each.
+
+    Timers hash into `slots` buckets by due tick; a bucket is only scanned
+    when the wheel reaches it, and timers more than one revolution away just
+    stay there until their tick comes. schedule() on an existing key moves
+    the timer, so pushing a timeout back on activity is O(1). Callbacks may
+    be coroutine functions; they run as tasks.
+    """
+
+    def __init__(self, tick: float = 1.0, slots: int = 512):
+        self.tick = tick
+        self._slots: list[dict[Hashable, _Timer]] = [{} for _ in range(slots)]
+        self._index: dict[Hashable, int] = {}  # key -> slot
+        self._now = 0  # ticks since start
+        self._started: Optional[float] = None
+        self._runner: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._tasks: set[asyncio.Task] = set()
+        self.fired = 0
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._index
+
+    def schedule(self, key: Hashable, delay: float, callback: Callable[[], Any]) -> None:
+        """Run callback after delay seconds, replacing any timer under the same key"""
+        self.cancel(key)
+        # Round up so a timer never fires early; at least one tick away
+        due = self._now + max(1, -(-int(delay * 1000) // int(self.tick * 1000)))
+        slot = due % len(self._slots)
+        self._slots[slot][key] = _Timer(due, callback)
+        self._index[key] = slot
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def cancel(self, key: Hashable) -> bool:
+        slot = self._index.pop(key, None)
+        if slot is None:
+            return False
+        del self._slots[slot][key]
+        return True
+
+    def start(self) -> None:
+        if self._runner is None:
+            self._wakeup = asyncio.Event()
+            self._runner = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop ticking and cancel callbacks that are still running"""
+        if self._runner is not None:
+            self._runner.cancel()
+            await asyncio.gather(self._runner, return_exceptions=True)
+            self._runner = None
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        self._started = loop.time() - self._now * self.tick
+        while True:
+            if not self._index:
+                # Nothing to do: sleep until something is scheduled, then restart the clock here
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                self._started = loop.time() - self._now * self.tick
+            target = int((loop.time() - self._started) / self.tick)
+            # Catch up on ticks missed while the loop was busy
+            while self._now < target:
+                self._now += 1
+                self._expire(self._slots[self._now % len(self._slots)])
+            await asyncio.sleep(max(0.0, self._started + (self._now + 1) * self.tick - loop.time()))
+
+    def _expire(self, bucket: dict[Hashable, _Timer]) -> None:
+        due = [key for key, timer in bucket.items() if timer.due <= self._now]
+        for key in due:
+            timer = bucket.pop(key)
+            del self._index[key]
+            self.fired += 1
+            try:
+                result = timer.callback()
+                if inspect.isawaitable(result):
+                    task = asyncio.ensure_future(result)
+                    self._tasks.add(task)
+                    task.add_done_callback(self._finished)
+            except Exception:
+                logger.exception(f"Timer {key!r} failed")
+
+    def _finished(self, task: asyncio.Task) -> None:
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Timer callback failed", exc_info=task.exception())
+
+    def stats(self) -> dict[str, Any]:
+        return {'timers': len(self._index), 'running_callbacks': len(self._tasks), 'fired': self.fired}
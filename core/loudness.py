@@ -0,0 +1,166 @@
+"""Persistent per-track loudness measurements for single-pass volume normalization"""
+import asyncio
+import logging
+import os
+import re
+import sqlite3
+import time
+from typing import Any, Optional
+from core.cache import TTLCache
+from core.ffmpeg import run_ffmpeg
+from core.sqlite_store import SQLiteStore
+
+logger = logging.getLogger("musicbot")
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS loudness (
+    video_id TEXT PRIMARY KEY,
+    lufs REAL NOT NULL,
+    measured REAL NOT NULL
+);
+'''
+
+# Integrated loudness from the ebur128 filter's summary
+_INTEGRATED_RE = re.compile(rb'I:\s+(-?\d+(?:\.\d+)?) LUFS')
+# Only the start of long tracks is measured; it is representative enough and bounds the cost
+_MAX_ANALYSIS_SECONDS = 600
+# Tracks waiting for analysis beyond this are dropped; they are picked up on a later play
+_MAX_PENDING = 100
+# Failed tracks aren't retried for this long
+_RETRY_AFTER = 60 * 60
+
+class LoudnessIndex(SQLiteStore):
+    """
+    Integrated loudness (LUFS) per video ID, measured once in the background
+    with FFmpeg's ebur128 filter and kept in SQLite. gain() turns it into a
+    static volume factor, so normalization costs nothing at play time.
+
+    At most `workers` measurements run at once, niced and single-threaded,
+    so they don't take CPU from the FFmpegs feeding voice connections.
+    """
+    SCHEMA = _SCHEMA
+
+    def __init__(self, path: Optional[str], *, target: float, max_boost: float, workers: int = 1):
+        super().__init__(path, 'loudness-index')
+        self.target = target
+        self.max_boost = max_boost
+        self.workers = max(1, workers)
+        self._lufs: dict[str, float] = {}
+        self._loaded = False
+        self._load_lock: Optional[asyncio.Lock] = None
+        self._pending: dict[str, asyncio.Task] = {}
+        self._failed = TTLCache(max_size=10000, ttl=_RETRY_AFTER)
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.measured = 0
+        self.failures = 0
+        self.dropped = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.path)
+
+    async def load(self) -> None:
+        """Read the whole index into memory once, so gain() never touches disk"""
+        if self._loaded or not self.enabled:
+            return
+        if self._load_lock is None:
+            self._load_lock = asyncio.Lock()
+        async with self._load_lock:
+            if self._loaded:
+                return
+            try:
+                self._lufs.update(await self._run(self._read_all))
+            except sqlite3.Error as e:
+                logger.warning(f"Loudness index could not be read: {e}")
+            self._loaded = True
+            logger.info(f"Loudness index opened at {self.path} ({len(self._lufs)} tracks)")
+
+    def _read_all(self) -> dict[str, float]:
+        return dict(self._connect().execute('SELECT video_id, lufs FROM loudness'))
+
+    def gain(self, video_id: Optional[str]) -> float:
+        """Linear volume factor that brings the track to the target loudness; 1.0 if unmeasured"""
+        lufs = self._lufs.get(video_id) if video_id else None
+        if lufs is None:
+            return 1.0
+        # Boosting is capped: quiet tracks would clip, and near-silence would be amplified to noise
+        return 10 ** (min(self.target - lufs, self.max_boost) / 20)
+
+    def analyze(self, video_id: Optional[str], stream: dict[str, Any], duration: int) -> None:
+        """Measure a track in the background unless it is already known"""
+        if not self.enabled or not self._loaded or not video_id or not duration or stream.get('is_live'):
+            return
+        if video_id in self._lufs or video_id in self._pending or self._failed.get(video_id):
+            return
+        if len(self._pending) >= _MAX_PENDING:
+            self.dropped += 1
+            return
+        task = asyncio.create_task(self._analyze(video_id, stream['url'], bool(stream.get('local'))))
+        self._pending[video_id] = task
+        task.add_done_callback(lambda _: self._pending.pop(video_id, None))
+
+    async def _analyze(self, video_id: str, url: str, local: bool) -> None:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.workers)
+        async with self._semaphore:
+            try:
+                lufs = await self._measure(url, local)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.failures += 1
+                self._failed.put(video_id, True)
+                logger.debug(f"Loudness analysis failed for {video_id}: {e}")
+                return
+            self._lufs[video_id] = lufs
+            self.measured += 1
+            try:
+                await self._run(self._write, video_id, lufs)
+            except sqlite3.Error as e:
+                logger.warning(f"Loudness index write failed: {e}")
+            logger.debug(f"Measured {video_id} at {lufs:.1f} LUFS")
+
+    async def _measure(self, url: str, local: bool) -> float:
+        reconnect = [] if local else ['-reconnect', '1', '-reconnect_streamed', '1', '-reconnect_delay_max', '5']
+        stderr = await run_ffmpeg(
+            '-nostdin', '-hide_banner', '-nostats', '-threads', '1',
+            *reconnect, '-t', str(_MAX_ANALYSIS_SECONDS), '-i', url,
+            # Per-frame readings go to the verbose log level, leaving just the summary
+            '-map', '0:a:0', '-vn', '-af', 'ebur128=framelog=verbose', '-f', 'null', '-',
+            timeout=_MAX_ANALYSIS_SECONDS + 120,
+            preexec_fn=_lower_priority if hasattr(os, 'nice') else None
+        )
+        matches = _INTEGRATED_RE.findall(stderr)
+        if not matches:
+            raise RuntimeError("no loudness summary in FFmpeg output")
+        # The summary is printed last
+        return float(matches[-1])
+
+    def _write(self, video_id: str, lufs: float) -> None:
+        conn = self._connect()
+        conn.execute(
+            'INSERT OR REPLACE INTO loudness (video_id, lufs, measured) VALUES (?, ?, ?)',
+            (video_id, lufs, time.time())
+        )
+        conn.commit()
+
+    async def close(self) -> None:
+        """Cancel pending measurements and close the database"""
+        tasks = list(self._pending.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await super().close()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            'tracks': len(self._lufs),
+            'measured': self.measured,
+            'failures': self.failures,
+            'dropped': self.dropped,
+            'pending': len(self._pending),
+        }
+
+def _lower_priority() -> None:
+    # Runs in the child before exec: analysis only gets CPU that playback leaves over
+    os.nice(10)
@@ -1,64 +1,326 @@
 """Music player logic and queue management"""
-from collections import deque
-from dataclasses import dataclass
-from typing import Optional, Deque
+from typing import Any, Awaitable, Callable, Optional
 import asyncio
+import logging
+from config.settings import Config
+from core.track import Track
+from core.track_list import TrackList
+from core.queue_store import QueueStore
 
-@dataclass
-class Track:
-    info: dict
+logger = logging.getLogger("musicbot")
+
+# Journal entries past the last snapshot before the queue is re-snapshotted
+# (also scaled by queue length so big queues aren't rewritten too often)
+_JOURNAL_COMPACT_MIN = 256
+
+# Called with (queue, track) so it can honour per-guild playback settings
+Resolver = Callable[['MusicQueue', Track], Awaitable[Any]]
+
+def _release_prefetch(task: asyncio.Task) -> None:
+    """Cancel a look-ahead task or free the source it already produced"""
+    if not task.done():
+        task.cancel()
+        return
+    if task.cancelled() or task.exception() is not None:
+        return
+    cleanup = getattr(task.result(), 'cleanup', None)
+    if cleanup:
+        cleanup()
+
+def _log_prefetch_failure(task: asyncio.Task) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        logger.debug(f"Prefetch failed: {task.exception()}")
 
 class MusicQueue:
     """Per-guild music queue manager"""
-    def __init__(self, guild_id: int):
+    def __init__(
+        self,
+        guild_id: int,
+        resolver: Optional[Resolver] = None,
+        prefetch_count: int = 0,
+        store: Optional[QueueStore] = None
+    ):
         self.guild_id = guild_id
-        self.queue: Deque[Track] = deque()
-        self.now_playing: Optional[Track] = None
-        self.repeat_mode: bool = False
+        self.queue: TrackList = TrackList()
+        self._now_playing: Any = None
+        self._repeat_mode: bool = False
+        self._audio_mode: str = Config.AUDIO_MODE
+        self.volume: float = Config.AUDIO_VOLUME
         self.lock: asyncio.Lock = asyncio.Lock()
-    
+        # Look-ahead: resolves the next tracks in the background
+        self.resolver = resolver
+        self.prefetch_count = prefetch_count
+        self._prefetched: dict[int, tuple[Track, asyncio.Task]] = {}
+        # Every change is journaled so the queue survives restarts
+        self.store = store
+        self._journal_len = 0
+        # No snapshot written yet: the journal still holds whatever was saved before
+        self._snapshotted = False
+
+    @property
+    def now_playing(self) -> Any:
+        """The playing source (anything with a .track), or None"""
+        return self._now_playing
+
+    @now_playing.setter
+    def now_playing(self, source: Any) -> None:
+        self._now_playing = source
+        track = getattr(source, 'track', source)
+        self._record('current', track.to_dict() if track is not None else None)
+
+    @property
+    def repeat_mode(self) -> bool:
+        return self._repeat_mode
+
+    @repeat_mode.setter
+    def repeat_mode(self, value: bool) -> None:
+        self._repeat_mode = value
+        self._record('settings', self._settings())
+
+    @property
+    def audio_mode(self) -> str:
+        return self._audio_mode
+
+    @audio_mode.setter
+    def audio_mode(self, value: str) -> None:
+        self._audio_mode = value
+        self._record('settings', self._settings())
+
     async def enqueue(self, tracks: list[Track]):
         async with self.lock:
             self.queue.extend(tracks)
-    
+            self._record('extend', [track.to_dict() for track in tracks])
+            self._sync_prefetch()
+
     async def dequeue(self) -> Optional[Track]:
         async with self.lock:
             if not self.queue:
                 return None
-            return self.queue.popleft()
-    
+            track = self.queue.popleft()
+            self._record('pop', 0)
+            # Keep the popped track's prefetch around for take_prefetched()
+            self._sync_prefetch(keep=track)
+            return track
+
     async def clear(self):
         async with self.lock:
             self.queue.clear()
-    
+            self._record('clear', None)
+            self._sync_prefetch()
+
     async def shuffle(self):
         async with self.lock:
-            import random
-            temp = list(self.queue)
-            random.shuffle(temp)
-            self.queue = deque(temp)
-    
+            self.queue.shuffle()
+            self.save()
+            self._sync_prefetch()
+
     async def remove(self, index: int) -> Optional[Track]:
         async with self.lock:
             if 0 <= index < len(self.queue):
-                temp = list(self.queue)
-                removed = temp.pop(index)
-                self.queue = deque(temp)
+                removed = self.queue.pop(index)
+                self._record('pop', index)
+                self._sync_prefetch()
                 return removed
             return None
-    
+
+    async def insert(self, index: int, tracks: list[Track]):
+        """Insert tracks so the first one ends up at index"""
+        async with self.lock:
+            for offset, track in enumerate(tracks):
+                self.queue.insert(index + offset, track)
+            self._record('insert', [index, [track.to_dict() for track in tracks]])
+            self._sync_prefetch()
+
+    async def move(self, source: int, destination: int) -> Optional[Track]:
+        async with self.lock:
+            if not (0 <= source < len(self.queue) and 0 <= destination < len(self.queue)):
+                return None
+            moved = self.queue.move(source, destination)
+            self._record('move', [source, destination])
+            self._sync_prefetch()
+            return moved
+
+    async def jump(self, index: int) -> list[Track]:
+        """Drop the tracks before index so it is the next one up"""
+        async with self.lock:
+            skipped = self.queue.remove_range(0, index)
+            self._record('remove_range', [0, index])
+            self._sync_prefetch()
+            return skipped
+
     def size(self) -> int:
         return len(self.queue)
 
+    @property
+    def pristine(self) -> bool:
+        """True until the queue is restored or first changed; the saved journal is untouched"""
+        return not self._snapshotted
+
+    def save(self) -> None:
+        """Write a full snapshot, replacing the guild's journal"""
+        if self.store is None:
+            return
+        current = getattr(self._now_playing, 'track', self._now_playing)
+        self.store.snapshot(self.guild_id, {
+            'tracks': [track.to_dict() for track in self.queue],
+            'current': current.to_dict() if current is not None else None,
+            **self._settings(),
+        })
+        self._journal_len = 0
+        self._snapshotted = True
+
+    def restore(self, ops: list[tuple[str, Any]]) -> None:
+        """Replay journaled operations (without re-journaling them)"""
+        current = None
+        for op, payload in ops:
+            if op == 'snapshot':
+                self.queue.clear()
+                self.queue.extend(Track.from_dict(data) for data in payload['tracks'])
+                current = payload['current']
+                self._apply_settings(payload)
+            elif op == 'extend':
+                self.queue.extend(Track.from_dict(data) for data in payload)
+            elif op == 'insert':
+                index, tracks = payload
+                for offset, data in enumerate(tracks):
+                    self.queue.insert(index + offset, Track.from_dict(data))
+            elif op == 'pop':
+                if payload < len(self.queue):
+                    self.queue.pop(payload)
+            elif op == 'move':
+                self.queue.move(*payload)
+            elif op == 'remove_range':
+                self.queue.remove_range(*payload)
+            elif op == 'clear':
+                self.queue.clear()
+            elif op == 'current':
+                current = payload
+            elif op == 'settings':
+                self._apply_settings(payload)
+        if current is not None:
+            # The voice connection is gone, so the interrupted track plays again first
+            self.queue.insert(0, Track.from_dict(current))
+        # Start a fresh journal from the restored state
+        self.save()
+
+    def _settings(self) -> dict[str, Any]:
+        return {'repeat_mode': self._repeat_mode, 'audio_mode': self._audio_mode}
+
+    def _apply_settings(self, payload: dict[str, Any]) -> None:
+        self._repeat_mode = payload.get('repeat_mode', self._repeat_mode)
+        self._audio_mode = payload.get('audio_mode', self._audio_mode)
+
+    def _record(self, op: str, payload: Any) -> None:
+        if self.store is None:
+            return
+        self._journal_len += 1
+        # The first change to a queue that wasn't restored replaces the old journal
+        if not self._snapshotted or self._journal_len > max(_JOURNAL_COMPACT_MIN, 2 * len(self.queue)):
+            self.save()
+        else:
+            self.store.record(self.guild_id, op, payload)
+
+    def take_prefetched(self, track: Track) -> Optional[asyncio.Task]:
+        """Hand over the look-ahead task for a dequeued track, if any"""
+        entry = self._prefetched.pop(id(track), None)
+        if entry is None or entry[0] is not track:
+            return None
+        return entry[1]
+
+    def discard_prefetched(self) -> None:
+        """Drop all look-ahead work (e.g. on disconnect)"""
+        for _, task in self._prefetched.values():
+            _release_prefetch(task)
+        self._prefetched.clear()
+
+    def _sync_prefetch(self, keep: Optional[Track] = None) -> None:
+        """Resolve the next N tracks and invalidate entries no longer in the window"""
+        if not self.resolver or self.prefetch_count <= 0:
+            return
+
+        window = self.queue.view(0, self.prefetch_count)
+        wanted = {id(track) for track in window}
+        if keep is not None:
+            wanted.add(id(keep))
+
+        for key in list(self._prefetched):
+            if key not in wanted:
+                _, task = self._prefetched.pop(key)
+                _release_prefetch(task)
+
+        for track in window:
+            if id(track) not in self._prefetched:
+                task = asyncio.create_task(self._resolve(track))
+                task.add_done_callback(_log_prefetch_failure)
+                self._prefetched[id(track)] = (track, task)
+
+    async def _resolve(self, track: Track) -> Any:
+        title = track.title
+        try:
+            return await self.resolver(self, track)
+        finally:
+            # Resolving fills in what the flat entry lacked; keep the total and rendered pages in step
+            self.queue.refresh(track, title_changed=track.title != title)
+
 class MusicPlayer:
     """Manages music queues across guilds"""
-    def __init__(self):
+    def __init__(self, resolver: Optional[Resolver] = None, store: Optional[QueueStore] = None):
         self.queues: dict[int, MusicQueue] = {}
-    
+        self.resolver = resolver
+        self.store = store
+
     def get_queue(self, guild_id: int) -> MusicQueue:
         if guild_id not in self.queues:
-            self.queues[guild_id] = MusicQueue(guild_id)
+            # Nothing is written until the queue changes, so restore() can still load the journal
+            self.queues[guild_id] = MusicQueue(guild_id, self.resolver, Config.PREFETCH_COUNT, self.store)
         return self.queues[guild_id]
-    
+
+    def _restored(self, guild_id: int) -> Optional[MusicQueue]:
+        """The guild's queue if it no longer needs restoring"""
+        queue = self.queues.get(guild_id)
+        if queue is not None and (self.store is None or not queue.pristine):
+            return queue
+        return None
+
+    async def restore(self, guild_id: int) -> MusicQueue:
+        """Load a guild's persisted queue the first time it is used after startup"""
+        if self.store is None or self._restored(guild_id) is not None:
+            return self.get_queue(guild_id)
+        ops = await self.store.load(guild_id)
+        # Restored or changed by someone else meanwhile
+        existing = self._restored(guild_id)
+        if existing is not None:
+            return existing
+        queue = MusicQueue(guild_id, self.resolver, Config.PREFETCH_COUNT, self.store)
+        try:
+            queue.restore(ops)
+        except (IndexError, KeyError, TypeError, ValueError) as e:
+            logger.warning(f"Discarding unreadable queue journal for guild {guild_id}: {e}")
+            queue = MusicQueue(guild_id, self.resolver, Config.PREFETCH_COUNT, self.store)
+            queue.save()
+        self.queues[guild_id] = queue
+        if ops:
+            logger.info(f"Restored queue with {len(queue.queue)} track(s) for guild {guild_id}")
+        return queue
+
+    def evict(self, guild_id: int) -> bool:
+        """
+        Drop an idle guild's queue from memory. Its journal is kept, so the
+        next restore() brings it back; without a store only empty queues go.
+        """
+        queue = self.queues.get(guild_id)
+        if queue is None:
+            return False
+        if queue.size() and (self.store is None or not self.store.enabled):
+            return False
+        del self.queues[guild_id]
+        queue.discard_prefetched()
+        return True
+
     def cleanup(self, guild_id: int):
-        self.queues.pop(guild_id, None)
\ No newline at end of file
+        queue = self.queues.pop(guild_id, None)
+        if queue:
+            queue.discard_prefetched()
+        # Leaving voice ends the session; only crashes and restarts should restore
+        if self.store is not None:
+            self.store.drop(guild_id)
@@ -0,0 +1,106 @@
+"""Crash-safe per-guild queue journal"""
+import json
+import logging
+import sqlite3
+import time
+from typing import Any, Optional
+from core.sqlite_store import SQLiteStore
+
+logger = logging.getLogger("musicbot")
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS queue_journal (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    guild_id INTEGER NOT NULL,
+    op TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    created REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS queue_journal_guild ON queue_journal (guild_id, seq);
+'''
+
+class QueueStore(SQLiteStore):
+    """
+    Append-only SQLite journal of queue operations. Each change appends one
+    small row instead of rewriting the queue; a 'snapshot' row replaces the
+    guild's history when the journal grows too long. Writes are submitted to
+    one dedicated thread, which keeps them in order and off the event loop.
+    """
+    SCHEMA = _SCHEMA
+
+    def __init__(self, path: Optional[str], ttl: int):
+        super().__init__(path, 'queue-store')
+        self.ttl = ttl
+        self.writes = 0
+        self.restores = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.path)
+
+    def _opened(self, conn: sqlite3.Connection) -> None:
+        # Forget guilds that haven't touched their queue for a long time
+        conn.execute(
+            'DELETE FROM queue_journal WHERE guild_id IN '
+            '(SELECT guild_id FROM queue_journal GROUP BY guild_id HAVING MAX(created) <= ?)',
+            (time.time() - self.ttl,)
+        )
+        conn.commit()
+        logger.info(f"Queue store opened at {self.path}")
+
+    def record(self, guild_id: int, op: str, payload: Any) -> None:
+        """Append one operation (fire-and-forget; order is preserved)"""
+        if self.enabled:
+            self._executor.submit(self._append, guild_id, op, json.dumps(payload), op == 'snapshot')
+
+    def snapshot(self, guild_id: int, state: dict[str, Any]) -> None:
+        """Replace the guild's journal with its full current state"""
+        self.record(guild_id, 'snapshot', state)
+
+    def drop(self, guild_id: int) -> None:
+        if self.enabled:
+            self._executor.submit(self._drop, guild_id)
+
+    async def load(self, guild_id: int) -> list[tuple[str, Any]]:
+        """Operations to replay for a guild, oldest first"""
+        if not self.enabled:
+            return []
+        try:
+            ops = await self._run(self._load, guild_id)
+        except sqlite3.Error as e:
+            logger.warning(f"Queue restore failed for guild {guild_id}: {e}")
+            return []
+        if ops:
+            self.restores += 1
+        return ops
+
+    def stats(self) -> dict[str, int]:
+        return {'writes': self.writes, 'restores': self.restores}
+
+    def _append(self, guild_id: int, op: str, payload: str, replace: bool) -> None:
+        try:
+            conn = self._connect()
+            if replace:
+                conn.execute('DELETE FROM queue_journal WHERE guild_id = ?', (guild_id,))
+            conn.execute(
+                'INSERT INTO queue_journal (guild_id, op, payload, created) VALUES (?, ?, ?, ?)',
+                (guild_id, op, payload, time.time())
+            )
+            conn.commit()
+            self.writes += 1
+        except sqlite3.Error as e:
+            logger.warning(f"Queue journal write failed for guild {guild_id}: {e}")
+
+    def _drop(self, guild_id: int) -> None:
+        try:
+            conn = self._connect()
+            conn.execute('DELETE FROM queue_journal WHERE guild_id = ?', (guild_id,))
+            conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Queue journal cleanup failed for guild {guild_id}: {e}")
+
+    def _load(self, guild_id: int) -> list[tuple[str, Any]]:
+        rows = self._connect().execute(
+            'SELECT op, payload FROM queue_journal WHERE guild_id = ? ORDER BY seq', (guild_id,)
+        )
+        return [(op, json.loads(payload)) for op, payload in rows]
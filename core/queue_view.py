@@ -0,0 +1,59 @@
+"""Button pagination for the queue embed"""
+from typing import Optional
+import discord
+from core.embed_builder import EmbedBuilder
+from core.track_list import TrackList
+
+class QueueView(discord.ui.View):
+    """
+    Previous/next buttons under a queue embed. Pages are rendered when they
+    are first shown and reused until the queue changes.
+    """
+
+    def __init__(self, queue: TrackList, *, page: int = 0, timeout: float = 180):
+        super().__init__(timeout=timeout)
+        self.queue = queue
+        self.page = page
+        self.message: Optional[discord.Message] = None
+        self._update_buttons()
+
+    @property
+    def embed(self) -> discord.Embed:
+        return EmbedBuilder.queue_list(self.queue, page=self.page)
+
+    def _update_buttons(self) -> None:
+        # The queue may have shrunk since the last page was shown
+        pages = EmbedBuilder.queue_pages(self.queue)
+        self.page = min(max(0, self.page), pages - 1)
+        self.first.disabled = self.previous.disabled = self.page == 0
+        self.next.disabled = self.last.disabled = self.page >= pages - 1
+
+    async def _show(self, interaction: discord.Interaction, page: int) -> None:
+        self.page = page
+        self._update_buttons()
+        await interaction.response.edit_message(embed=self.embed, view=self)
+
+    @discord.ui.button(emoji='⏮️', style=discord.ButtonStyle.secondary)
+    async def first(self, interaction: discord.Interaction, button: discord.ui.Button) -> None:
+        await self._show(interaction, 0)
+
+    @discord.ui.button(emoji='◀️', style=discord.ButtonStyle.secondary)
+    async def previous(self, interaction: discord.Interaction, button: discord.ui.Button) -> None:
+        await self._show(interaction, self.page - 1)
+
+    @discord.ui.button(emoji='▶️', style=discord.ButtonStyle.secondary)
+    async def next(self, interaction: discord.Interaction, button: discord.ui.Button) -> None:
+        await self._show(interaction, self.page + 1)
+
+    @discord.ui.button(emoji='⏭️', style=discord.ButtonStyle.secondary)
+    async def last(self, interaction: discord.Interaction, button: discord.ui.Button) -> None:
+        await self._show(interaction, EmbedBuilder.queue_pages(self.queue) - 1)
+
+    async def on_timeout(self) -> None:
+        for item in self.children:
+            item.disabled = True
+        if self.message is not None:
+            try:
+                await self.message.edit(view=self)
+            except discord.HTTPException:
+                pass
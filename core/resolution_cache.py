@@ -0,0 +1,127 @@
+"""Persistent search-query to YouTube video cache"""
+import json
+import logging
+import sqlite3
+import time
+from typing import Any, Optional
+from core.sqlite_store import SQLiteStore
+
+logger = logging.getLogger("musicbot")
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS resolutions (
+    key TEXT PRIMARY KEY,
+    video_id TEXT NOT NULL,
+    info TEXT NOT NULL,
+    created REAL NOT NULL,
+    used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS resolutions_used ON resolutions (used);
+'''
+
+# Stay well below SQLite's bound-parameter limit
+_CHUNK = 500
+
+def query_key(query: str) -> str:
+    """Cache key for a free-text search (case and whitespace insensitive)"""
+    return 'query:' + ' '.join(query.casefold().split())
+
+def spotify_key(track_id: str) -> str:
+    return f'spotify:{track_id}'
+
+class ResolutionCache(SQLiteStore):
+    """
+    SQLite-backed map from normalized queries / Spotify track IDs to the chosen
+    YouTube video and its lightweight metadata. All database access happens on
+    one dedicated thread so the event loop never blocks on disk I/O.
+    """
+    SCHEMA = _SCHEMA
+
+    def __init__(self, path: Optional[str], ttl: int, max_entries: int):
+        super().__init__(path, 'resolution-cache')
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.path) and self.max_entries > 0
+
+    def _opened(self, conn: sqlite3.Connection) -> None:
+        logger.info(f"Resolution cache opened at {self.path}")
+
+    async def get_many(self, keys: list[str]) -> dict[str, dict[str, Any]]:
+        """Bulk lookup; returns only the keys that hit"""
+        if not self.enabled or not keys:
+            return {}
+        try:
+            found = await self._run(self._get_many, list(dict.fromkeys(keys)))
+        except sqlite3.Error as e:
+            logger.warning(f"Resolution cache lookup failed: {e}")
+            return {}
+        self.hits += len(found)
+        self.misses += len(set(keys)) - len(found)
+        return found
+
+    async def get(self, key: str) -> Optional[dict[str, Any]]:
+        return (await self.get_many([key])).get(key)
+
+    async def put_many(self, items: dict[str, dict[str, Any]]) -> None:
+        """Store key -> info mappings; info must contain the video 'id'"""
+        items = {key: info for key, info in items.items() if info.get('id')}
+        if not self.enabled or not items:
+            return
+        try:
+            await self._run(self._put_many, items)
+        except sqlite3.Error as e:
+            logger.warning(f"Resolution cache write failed: {e}")
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+        }
+
+    def _get_many(self, keys: list[str]) -> dict[str, dict[str, Any]]:
+        conn = self._connect()
+        now = time.time()
+        cutoff = now - self.ttl
+        found: dict[str, dict[str, Any]] = {}
+        for start in range(0, len(keys), _CHUNK):
+            chunk = keys[start:start + _CHUNK]
+            placeholders = ','.join('?' * len(chunk))
+            rows = conn.execute(
+                f'SELECT key, info FROM resolutions WHERE created > ? AND key IN ({placeholders})',
+                (cutoff, *chunk)
+            )
+            for key, info in rows:
+                found[key] = json.loads(info)
+        if found:
+            # Track recency for LRU eviction
+            conn.executemany('UPDATE resolutions SET used = ? WHERE key = ?', [(now, key) for key in found])
+            conn.commit()
+        return found
+
+    def _put_many(self, items: dict[str, dict[str, Any]]) -> None:
+        conn = self._connect()
+        now = time.time()
+        conn.executemany(
+            'INSERT OR REPLACE INTO resolutions (key, video_id, info, created, used) VALUES (?, ?, ?, ?, ?)',
+            [(key, info['id'], json.dumps(info), now, now) for key, info in items.items()]
+        )
+        removed = conn.execute('DELETE FROM resolutions WHERE created <= ?', (now - self.ttl,)).rowcount
+        (count,) = conn.execute('SELECT COUNT(*) FROM resolutions').fetchone()
+        if count > self.max_entries:
+            # Evict least recently used rows, with some headroom to avoid evicting on every write
+            excess = count - self.max_entries + self.max_entries // 10
+            removed += conn.execute(
+                'DELETE FROM resolutions WHERE key IN (SELECT key FROM resolutions ORDER BY used LIMIT ?)',
+                (excess,)
+            ).rowcount
+        conn.commit()
+        self.evictions += removed
@@ -0,0 +1,130 @@
+"""Priority and per-guild fair-share admission for yt-dlp executor jobs"""
+import asyncio
+import enum
+import logging
+import time
+from collections import OrderedDict, deque
+from contextvars import ContextVar
+from typing import Any, Optional
+from utils.errors import SchedulerOverloadedError
+
+logger = logging.getLogger("musicbot")
+
+class Priority(enum.IntEnum):
+    """Job classes, most urgent first"""
+    PLAYBACK = 0     # stream URL for a track that is about to play
+    INTERACTIVE = 1  # a user waiting on a search or the first page of a playlist
+    BULK = 2         # playlist paging and Spotify imports
+
+# Guild the current task works for; set by the music cog, inherited by the tasks it spawns
+current_guild: ContextVar[Optional[int]] = ContextVar('current_guild', default=None)
+# Lowest priority allowed for jobs in this context (e.g. BULK inside a Spotify import)
+priority_floor: ContextVar[Priority] = ContextVar('priority_floor', default=Priority.PLAYBACK)
+
+class FairScheduler:
+    """
+    Admits at most `slots` jobs at a time. Waiting jobs are served strictly by
+    priority, and round-robin across guilds within a priority, so one guild's
+    playlist import can't hold up another guild's next song. Non-playback jobs
+    are rejected with SchedulerOverloadedError once too many are waiting.
+    """
+
+    def __init__(self, slots: int, *, max_waiting: int, max_waiting_per_guild: int):
+        self.slots = max(1, slots)
+        self.max_waiting = max_waiting
+        self.max_waiting_per_guild = max_waiting_per_guild
+        self.running = 0
+        # Per priority: guild -> waiting futures; dict order is the round-robin order
+        self._waiting: list[OrderedDict[Optional[int], deque[asyncio.Future]]] = [OrderedDict() for _ in Priority]
+        self._depth = [0] * len(Priority)
+        self.granted = [0] * len(Priority)
+        self.queued = [0] * len(Priority)
+        self.rejected = [0] * len(Priority)
+
+    def waiting(self, priority: Optional[Priority] = None) -> int:
+        return sum(self._depth) if priority is None else self._depth[priority]
+
+    def _guild_waiting(self, guild_id: Optional[int]) -> int:
+        return sum(len(guilds.get(guild_id, ())) for guilds in self._waiting[Priority.INTERACTIVE:])
+
+    async def acquire(self, priority: Priority, guild_id: Optional[int] = None) -> float:
+        """Wait for a slot; returns the seconds spent waiting. Pair with release()"""
+        if self.running < self.slots and not self.waiting():
+            self.running += 1
+            self.granted[priority] += 1
+            return 0.0
+
+        if priority != Priority.PLAYBACK and (
+            self.waiting() >= self.max_waiting or self._guild_waiting(guild_id) >= self.max_waiting_per_guild
+        ):
+            self.rejected[priority] += 1
+            logger.warning(
+                f"Rejected {priority.name.lower()} yt-dlp job for guild {guild_id}: "
+                f"{self.waiting()} waiting, {self._guild_waiting(guild_id)} from this guild"
+            )
+            raise SchedulerOverloadedError("The bot is busy right now, please try again in a moment")
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiting[priority].setdefault(guild_id, deque()).append(future)
+        self._depth[priority] += 1
+        self.queued[priority] += 1
+        start = time.perf_counter()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted just as the caller was cancelled; hand the slot on
+                self.release()
+            else:
+                self._forget(priority, guild_id, future)
+            raise
+        waited = time.perf_counter() - start
+        self.granted[priority] += 1
+        logger.debug(
+            f"yt-dlp job ({priority.name.lower()}, guild {guild_id}) started after {waited:.3f}s; "
+            f"{self.waiting()} still waiting"
+        )
+        return waited
+
+    def release(self) -> None:
+        self.running -= 1
+        while self.running < self.slots:
+            future = self._pop_next()
+            if future is None:
+                return
+            self.running += 1
+            future.set_result(None)
+
+    def _pop_next(self) -> Optional[asyncio.Future]:
+        for priority, guilds in enumerate(self._waiting):
+            while guilds:
+                guild_id, queue = next(iter(guilds.items()))
+                future = queue.popleft()
+                self._depth[priority] -= 1
+                if queue:
+                    # This guild goes to the back of the line for its next job
+                    guilds.move_to_end(guild_id)
+                else:
+                    del guilds[guild_id]
+                if not future.done():
+                    return future
+        return None
+
+    def _forget(self, priority: Priority, guild_id: Optional[int], future: asyncio.Future) -> None:
+        queue = self._waiting[priority].get(guild_id)
+        if queue is None or future not in queue:
+            return
+        queue.remove(future)
+        self._depth[priority] -= 1
+        if not queue:
+            del self._waiting[priority][guild_id]
+
+    def stats(self) -> dict[str, Any]:
+        stats: dict[str, Any] = {'slots': self.slots, 'running': self.running, 'waiting': self.waiting()}
+        for priority in Priority:
+            name = priority.name.lower()
+            stats[f'{name}_waiting'] = self._depth[priority]
+            stats[f'{name}_granted'] = self.granted[priority]
+            stats[f'{name}_queued'] = self.queued[priority]
+            stats[f'{name}_rejected'] = self.rejected[priority]
+        return stats
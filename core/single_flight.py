@@ -0,0 +1,57 @@
+"""Coalescing of identical concurrent async calls"""
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable, Optional, TypeVar
+
+T = TypeVar('T')
+
+def _consume_exception(task: asyncio.Task) -> None:
+    # Every caller may have been cancelled; don't warn about an unretrieved error
+    if not task.cancelled():
+        task.exception()
+
+class SingleFlight:
+    """
+    Runs at most one call per key at a time. Callers arriving while a call is
+    in flight await the same task instead of starting their own. The task is
+    shielded, so cancelling one caller never cancels the work for the others;
+    each caller gets its own copy of the result.
+    """
+
+    def __init__(self):
+        self._inflight: dict[Hashable, asyncio.Task] = {}
+        self.started = 0
+        self.coalesced = 0
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
+    async def do(
+        self,
+        key: Hashable,
+        factory: Callable[[], Awaitable[T]],
+        copy: Optional[Callable[[T], T]] = None
+    ) -> T:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+            task.add_done_callback(_consume_exception)
+            self.started += 1
+        else:
+            self.coalesced += 1
+        result = await asyncio.shield(task)
+        return copy(result) if copy else result
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+
+    def stats(self) -> dict[str, Any]:
+        calls = self.started + self.coalesced
+        return {
+            'in_flight': len(self._inflight),
+            'started': self.started,
+            'coalesced': self.coalesced,
+            'coalesced_ratio': self.coalesced / calls if calls else 0.0,
+        }
@@ -0,0 +1,146 @@
+"""Async Spotify Web API client (client-credentials flow)"""
+import asyncio
+import logging
+import time
+from typing import Any, Optional
+import aiohttp
+from utils.errors import SpotifyAPIError
+from core.metrics import REGISTRY
+
+logger = logging.getLogger("musicbot")
+
+_REQUEST_SECONDS = REGISTRY.histogram('musicbot_spotify_request_seconds', 'Spotify Web API request latency', ('status',))
+
+class SpotifyClient:
+    """Non-blocking Spotify client with a pooled session and cached access token"""
+
+    API_URL = 'https://api.spotify.com/v1'
+    TOKEN_URL = 'https://accounts.spotify.com/api/token'
+    PLAYLIST_PAGE = 100  # fixed Spotify API limits per request
+    ALBUM_PAGE = 50
+    MAX_RETRIES = 3
+
+    def __init__(
+        self,
+        client_id: str,
+        client_secret: str,
+        *,
+        api_url: Optional[str] = None,
+        token_url: Optional[str] = None,
+        page_concurrency: int = 4,
+        timeout: float = 15
+    ):
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.api_url = (api_url or self.API_URL).rstrip('/')
+        self.token_url = token_url or self.TOKEN_URL
+        self.page_concurrency = max(1, page_concurrency)
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._token: Optional[str] = None
+        self._token_expires: float = 0.0
+        self._token_lock = asyncio.Lock()
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        # Created lazily so the session binds to the running event loop
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.page_concurrency * 2)
+            self._session = aiohttp.ClientSession(connector=connector, timeout=self.timeout)
+        return self._session
+
+    async def close(self) -> None:
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def _get_token(self, *, refresh: bool = False) -> str:
+        """Return a cached access token, fetching a new one when it is about to expire"""
+        async with self._token_lock:
+            if not refresh and self._token and time.monotonic() < self._token_expires:
+                return self._token
+
+            session = await self._get_session()
+            auth = aiohttp.BasicAuth(self.client_id, self.client_secret)
+            async with session.post(self.token_url, data={'grant_type': 'client_credentials'}, auth=auth) as resp:
+                if resp.status != 200:
+                    raise SpotifyAPIError(resp.status, f"Token request failed: {await resp.text()}")
+                payload = await resp.json()
+
+            self._token = payload['access_token']
+            # Refresh a minute early so in-flight requests never carry an expired token
+            self._token_expires = time.monotonic() + int(payload.get('expires_in', 3600)) - 60
+            return self._token
+
+    async def get(self, path: str, params: Optional[dict[str, Any]] = None) -> dict[str, Any]:
+        """GET an API path, refreshing the token on 401 and honouring 429 Retry-After"""
+        session = await self._get_session()
+        refresh = False
+
+        for attempt in range(self.MAX_RETRIES + 1):
+            token = await self._get_token(refresh=refresh)
+            refresh = False
+            headers = {'Authorization': f'Bearer {token}'}
+
+            start = time.perf_counter()
+            async with session.get(f'{self.api_url}{path}', params=params, headers=headers) as resp:
+                if resp.status == 200:
+                    payload = await resp.json()
+                    _REQUEST_SECONDS.observe(time.perf_counter() - start, status='200')
+                    return payload
+                _REQUEST_SECONDS.observe(time.perf_counter() - start, status=str(resp.status))
+
+                if attempt < self.MAX_RETRIES:
+                    if resp.status == 401:
+                        refresh = True
+                        continue
+                    if resp.status == 429:
+                        delay = float(resp.headers.get('Retry-After', '1'))
+                        logger.warning(f"Spotify rate limited, retrying in {delay}s")
+                        await asyncio.sleep(delay)
+                        continue
+
+                raise SpotifyAPIError(resp.status, f"{path}: {await resp.text()}")
+
+        raise SpotifyAPIError(0, f"{path}: retries exhausted")
+
+    async def _fetch_pages(
+        self,
+        path: str,
+        first_page: dict[str, Any],
+        page_size: int,
+        limit: int,
+        params: Optional[dict[str, Any]] = None
+    ) -> list[dict[str, Any]]:
+        """Fetch the remaining pages in parallel once the first page reveals the total"""
+        items = list(first_page.get('items') or [])
+        wanted = min(first_page.get('total') or 0, limit)
+        offsets = range(len(items), wanted, page_size)
+        if not offsets:
+            return items[:limit]
+
+        semaphore = asyncio.Semaphore(self.page_concurrency)
+
+        async def fetch(offset: int) -> list[dict[str, Any]]:
+            async with semaphore:
+                page = await self.get(path, {**(params or {}), 'limit': page_size, 'offset': offset})
+                return page.get('items') or []
+
+        pages = await asyncio.gather(*(fetch(offset) for offset in offsets))
+        for page in pages:
+            items.extend(page)
+        return items[:limit]
+
+    async def track(self, track_id: str) -> dict[str, Any]:
+        return await self.get(f'/tracks/{track_id}')
+
+    async def playlist_tracks(self, playlist_id: str, limit: int) -> list[dict[str, Any]]:
+        """Return up to limit playlist items in playlist order"""
+        path = f'/playlists/{playlist_id}/tracks'
+        params = {'fields': 'total,items(track(id,name,artists(name)))'}
+        first = await self.get(path, {**params, 'limit': min(self.PLAYLIST_PAGE, limit), 'offset': 0})
+        return await self._fetch_pages(path, first, self.PLAYLIST_PAGE, limit, params)
+
+    async def album_tracks(self, album_id: str, limit: int) -> list[dict[str, Any]]:
+        """Return up to limit album tracks in album order"""
+        album = await self.get(f'/albums/{album_id}')
+        return await self._fetch_pages(f'/albums/{album_id}/tracks', album['tracks'], self.ALBUM_PAGE, limit)
@@ -1,32 +1,46 @@
 """Spotify URL resolver"""
 import logging
 import re
-from typing import Optional
-import spotipy
-from spotipy.oauth2 import SpotifyClientCredentials
+from typing import NamedTuple, Optional
 from config.settings import Config
-from utils.errors import YTDLError
+from core.spotify_client import SpotifyClient
+from utils.errors import SpotifyAPIError, YTDLError
 
 logger = logging.getLogger("musicbot")
 
+class SpotifyEntry(NamedTuple):
+    """A Spotify track and the YouTube search query it maps to"""
+    track_id: Optional[str]
+    query: str
+
 class SpotifyHandler:
     """Handle Spotify URL resolution"""
     
     def __init__(self):
-        self.spotify: Optional[spotipy.Spotify] = None
+        self.spotify: Optional[SpotifyClient] = None
         if Config.has_spotify():
-            try:
-                auth_manager = SpotifyClientCredentials(
-                    client_id=Config.SPOTIFY_CLIENT_ID,
-                    client_secret=Config.SPOTIFY_CLIENT_SECRET
-                )
-                self.spotify = spotipy.Spotify(auth_manager=auth_manager)
-                logger.info("Spotify integration enabled")
-            except Exception as e:
-                logger.warning(f"Failed to initialize Spotify client: {e}")
+            self.spotify = SpotifyClient(
+                client_id=Config.SPOTIFY_CLIENT_ID,
+                client_secret=Config.SPOTIFY_CLIENT_SECRET,
+                api_url=Config.SPOTIFY_API_URL,
+                token_url=Config.SPOTIFY_TOKEN_URL,
+                page_concurrency=Config.SPOTIFY_PAGE_CONCURRENCY
+            )
+            logger.info("Spotify integration enabled")
         else:
             logger.info("Spotify integration disabled (no credentials)")
     
+    async def close(self) -> None:
+        """Close the pooled HTTP session"""
+        if self.spotify:
+            await self.spotify.close()
+    
+    @staticmethod
+    def _to_query(track: dict) -> str:
+        artists = ', '.join([artist['name'] for artist in track.get('artists', [])])
+        track_name = track.get('name', 'Unknown')
+        return f"{artists} - {track_name}"
+    
     def is_spotify_url(self, url: str) -> bool:
         """Check if URL is a Spotify link"""
         return 'spotify.com' in url or 'open.spotify' in url
@@ -50,121 +64,89 @@ class SpotifyHandler:
     
     async def resolve_track(self, track_id: str) -> Optional[str]:
         """Resolve Spotify track to YouTube search query"""
+        return (await self._track_entries(track_id))[0].query
+        
+    async def resolve_playlist(self, playlist_id: str) -> list[str]:
+        """Resolve Spotify playlist to list of YouTube search queries"""
+        return [entry.query for entry in await self._playlist_entries(playlist_id)]
+    
+    async def resolve_album(self, album_id: str) -> list[str]:
+        """Resolve Spotify album to list of YouTube search queries"""
+        return [entry.query for entry in await self._album_entries(album_id)]
+    
+    async def resolve(self, url: str) -> list[str]:
+        """
+        Resolve Spotify URL to YouTube search queries.
+        Returns list of search queries (one for track, multiple for playlist/album).
+        """
+        return [entry.query for entry in await self.resolve_entries(url)]
+    
+    async def resolve_entries(self, url: str) -> list[SpotifyEntry]:
+        """Like resolve(), but keeps the Spotify track ID next to each query"""
+        spotify_id, spotify_type = self.extract_id(url)
+        
+        if not spotify_id or not spotify_type:
+            raise YTDLError("Invalid Spotify URL")
+        
+        if spotify_type == 'track':
+            return await self._track_entries(spotify_id)
+        elif spotify_type == 'playlist':
+            return await self._playlist_entries(spotify_id)
+        elif spotify_type == 'album':
+            return await self._album_entries(spotify_id)
+        
+        raise YTDLError(f"Unsupported Spotify type: {spotify_type}")
+    
+    async def _track_entries(self, track_id: str) -> list[SpotifyEntry]:
         if not self.spotify:
             raise YTDLError("Spotify support not configured")
         
         try:
-            track = self.spotify.track(track_id)
-            artists = ', '.join([artist['name'] for artist in track['artists']])
-            query = f"{artists} - {track['name']}"
+            track = await self.spotify.track(track_id)
+            query = self._to_query(track)
             logger.info(f"Resolved Spotify track: {query}")
-            return query
+            return [SpotifyEntry(track.get('id') or track_id, query)]
         except Exception as e:
             logger.error(f"Failed to resolve Spotify track {track_id}: {e}")
             raise YTDLError(f"Failed to resolve Spotify track: {e}")
-        
-    async def resolve_playlist(self, playlist_id: str) -> list[str]:
-        """Resolve Spotify playlist to list of YouTube search queries"""
+    
+    async def _playlist_entries(self, playlist_id: str) -> list[SpotifyEntry]:
         if not self.spotify:
             raise YTDLError("Spotify support not configured")
         
         try:
-            queries = []
-            offset = 0
-            limit = 100  # fixed Spotify API limit per request
+            try:
+                items = await self.spotify.playlist_tracks(playlist_id, limit=Config.PLAYLIST_MAX)
+            except SpotifyAPIError as e:
+                # Handle 404 or permission errors
+                if e.status == 404:
+                    raise YTDLError("Spotify playlist not found or is private")
+                elif e.status == 403:
+                    raise YTDLError("No permission to access this Spotify playlist")
+                raise
             
-            while len(queries) < Config.PLAYLIST_MAX:
-                try:
-                    results = self.spotify.playlist_tracks(
-                        playlist_id, 
-                        limit=min(limit, Config.PLAYLIST_MAX - len(queries)),
-                        offset=offset
-                    )
-                except Exception as e:
-                    # Handle 404 or permission errors
-                    if '404' in str(e):
-                        raise YTDLError("Spotify playlist not found or is private")
-                    elif '403' in str(e):
-                        raise YTDLError("No permission to access this Spotify playlist")
-                    raise
-                
-                items = results.get('items', [])
-                if not items:
-                    break
-                
-                for item in items:
-                    if not item or not item.get('track'):
-                        continue
-                    track = item['track']
-                    artists = ', '.join([artist['name'] for artist in track.get('artists', [])])
-                    track_name = track.get('name', 'Unknown')
-                    query = f"{artists} - {track_name}"
-                    queries.append(query)
-                    
-                    if len(queries) >= Config.PLAYLIST_MAX:
-                        break
-                
-                # Check if there are more items
-                if not results.get('next'):
-                    break
-                    
-                offset += limit
+            entries = [
+                SpotifyEntry(item['track'].get('id'), self._to_query(item['track']))
+                for item in items
+                if item and item.get('track')
+            ]
             
-            logger.info(f"Resolved Spotify playlist: {len(queries)} tracks")
-            return queries
+            logger.info(f"Resolved Spotify playlist: {len(entries)} tracks")
+            return entries
         except Exception as e:
             logger.error(f"Failed to resolve Spotify playlist {playlist_id}: {e}")
             raise YTDLError(f"Failed to resolve Spotify playlist: {e}")
     
-    async def resolve_album(self, album_id: str) -> list[str]:
-        """Resolve Spotify album to list of YouTube search queries"""
+    async def _album_entries(self, album_id: str) -> list[SpotifyEntry]:
         if not self.spotify:
             raise YTDLError("Spotify support not configured")
         
         try:
-            album = self.spotify.album(album_id)
-            queries = []
-            
-            # Get all tracks (albums are usually smaller, but paginate if needed)
-            tracks = album['tracks']['items']
-            offset = len(tracks)
-            
-            # If album has more tracks, fetch them
-            while len(tracks) < album['tracks']['total'] and len(queries) < Config.PLAYLIST_MAX:
-                more_tracks = self.spotify.album_tracks(album_id, limit=50, offset=offset)
-                if not more_tracks.get('items'):
-                    break
-                tracks.extend(more_tracks['items'])
-                offset += 50
+            tracks = await self.spotify.album_tracks(album_id, limit=Config.PLAYLIST_MAX)
+            entries = [SpotifyEntry(track.get('id'), self._to_query(track)) for track in tracks if track]
             
-            for track in tracks[:Config.PLAYLIST_MAX]:
-                artists = ', '.join([artist['name'] for artist in track.get('artists', [])])
-                track_name = track.get('name', 'Unknown')
-                query = f"{artists} - {track_name}"
-                queries.append(query)
-            
-            logger.info(f"Resolved Spotify album: {len(queries)} tracks")
-            return queries
+            logger.info(f"Resolved Spotify album: {len(entries)} tracks")
+            return entries
         except Exception as e:
             logger.error(f"Failed to resolve Spotify album {album_id}: {e}")
             raise YTDLError(f"Failed to resolve Spotify album: {e}")
-    
-    async def resolve(self, url: str) -> list[str]:
-        """
-        Resolve Spotify URL to YouTube search queries.
-        Returns list of search queries (one for track, multiple for playlist/album).
-        """
-        spotify_id, spotify_type = self.extract_id(url)
-        
-        if not spotify_id or not spotify_type:
-            raise YTDLError("Invalid Spotify URL")
-        
-        if spotify_type == 'track':
-            query = await self.resolve_track(spotify_id)
-            return [query] if query else []
-        elif spotify_type == 'playlist':
-            return await self.resolve_playlist(spotify_id)
-        elif spotify_type == 'album':
-            return await self.resolve_album(spotify_id)
-        
-        raise YTDLError(f"Unsupported Spotify type: {spotify_type}")
\ No newline at end of file
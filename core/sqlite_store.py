@@ -0,0 +1,48 @@
+"""Base for the bot's SQLite-backed stores"""
+import asyncio
+import concurrent.futures
+import os
+import sqlite3
+from typing import Optional
+
+class SQLiteStore:
+    """
+    One SQLite file in WAL mode, opened lazily with SCHEMA applied. The
+    connection is only used from one dedicated thread, which keeps database
+    access in order and off the event loop.
+    """
+    SCHEMA = ''
+
+    def __init__(self, path: Optional[str], thread_name: str):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix=thread_name)
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.executescript(self.SCHEMA)
+            self._conn = conn
+            self._opened(conn)
+        return self._conn
+
+    def _opened(self, conn: sqlite3.Connection) -> None:
+        """Called once on the store's thread after the database is opened"""
+
+    async def _run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    async def close(self) -> None:
+        """Finish queued work and close the database"""
+        await self._run(self._close)
+
+    def _close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
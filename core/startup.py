@@ -0,0 +1,74 @@
+"""Startup phase timing and change-detecting slash command sync"""
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Optional
+from discord import app_commands
+from core.metrics import REGISTRY
+
+logger = logging.getLogger("musicbot")
+
+class StartupTimer:
+    """Wall time of each startup phase, from one mark() to the next"""
+
+    def __init__(self, started: Optional[float] = None):
+        self.started = started if started is not None else time.perf_counter()
+        self._last = self.started
+        self.phases: dict[str, float] = {}
+        REGISTRY.gauge(
+            'musicbot_startup_seconds', 'Duration of each startup phase of this process', ('phase',),
+            collector=lambda: [({'phase': phase}, seconds) for phase, seconds in list(self.phases.items())]
+        )
+
+    def mark(self, phase: str) -> float:
+        """End the named phase now; returns its duration"""
+        now = time.perf_counter()
+        self.phases[phase] = now - self._last
+        self._last = now
+        return self.phases[phase]
+
+    @property
+    def total(self) -> float:
+        return self._last - self.started
+
+    def report(self) -> str:
+        phases = ', '.join(f'{phase} {seconds:.2f}s' for phase, seconds in self.phases.items())
+        return f'{phases} (total {self.total:.2f}s)'
+
+def command_tree_hash(tree: app_commands.CommandTree) -> str:
+    """Digest of the global command payload that sync() would upload"""
+    payload = sorted(
+        (command.to_dict(tree) for command in tree.get_commands()),
+        key=lambda command: (command.get('type', 1), command['name'])
+    )
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+async def sync_commands(tree: app_commands.CommandTree, state_path: Optional[str]) -> Optional[int]:
+    """
+    Sync global slash commands unless they are unchanged since the last sync
+    recorded in state_path. Returns the number of synced commands, or None
+    if the sync was skipped. Without a state path every call syncs.
+    """
+    # Another application (e.g. a staging token) needs its own sync
+    state = f'{tree.client.application_id}:{command_tree_hash(tree)}'
+    if state_path:
+        try:
+            with open(state_path, encoding='utf-8') as file:
+                if file.read().strip() == state:
+                    return None
+        except OSError:
+            pass
+
+    synced = await tree.sync()
+    if state_path:
+        try:
+            directory = os.path.dirname(state_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(state_path, 'w', encoding='utf-8') as file:
+                file.write(state)
+        except OSError as e:
+            logger.warning(f"Could not record slash command sync state: {e}")
+    return len(synced)
@@ -0,0 +1,129 @@
+"""Compact track records"""
+import sys
+import weakref
+from typing import Any, Optional
+
+class TrackInfo:
+    """
+    Per-video metadata. Records are interned by video ID, so the same video
+    queued in many guilds (or many times) shares one object.
+    """
+    __slots__ = ('id', 'title', 'duration', 'uploader', 'uploader_url', 'webpage_url', 'thumbnail', '__weakref__')
+
+    FIELDS = ('id', 'title', 'duration', 'uploader', 'uploader_url', 'webpage_url', 'thumbnail')
+
+    _interned: 'weakref.WeakValueDictionary[str, TrackInfo]' = weakref.WeakValueDictionary()
+
+    def __init__(
+        self,
+        id: Optional[str] = None,
+        title: Optional[str] = None,
+        duration: int = 0,
+        uploader: Optional[str] = None,
+        uploader_url: Optional[str] = None,
+        webpage_url: Optional[str] = None,
+        thumbnail: Optional[str] = None
+    ):
+        self.id = id
+        self.title = title
+        self.duration = duration
+        # Uploader names repeat a lot across playlists
+        self.uploader = sys.intern(uploader) if uploader else None
+        self.uploader_url = uploader_url
+        self.webpage_url = webpage_url
+        self.thumbnail = thumbnail
+
+    @staticmethod
+    def _fields_from(info: dict[str, Any]) -> dict[str, Any]:
+        thumbnail = info.get('thumbnail')
+        if not thumbnail and info.get('thumbnails'):
+            thumbnail = info['thumbnails'][-1].get('url')
+        return {
+            'id': info.get('id'),
+            'title': info.get('title'),
+            'duration': int(info.get('duration') or 0),
+            'uploader': info.get('uploader') or info.get('channel'),
+            'uploader_url': info.get('uploader_url') or info.get('channel_url'),
+            # Flat playlist/search entries carry the watch page in 'url'
+            'webpage_url': info.get('webpage_url') or info.get('url'),
+            'thumbnail': thumbnail,
+        }
+
+    @classmethod
+    def from_info(cls, info: dict[str, Any]) -> 'TrackInfo':
+        """Build (or reuse) the record for a yt-dlp info dict or flat entry"""
+        video_id = info.get('id')
+        record = cls._interned.get(video_id) if video_id else None
+        if record is None:
+            record = cls(**cls._fields_from(info))
+            if video_id:
+                cls._interned[video_id] = record
+        else:
+            record.update(info)
+        return record
+
+    def update(self, info: dict[str, Any]) -> None:
+        """Fill fields a flat entry didn't have (e.g. after full extraction)"""
+        for field, value in self._fields_from(info).items():
+            if value and not getattr(self, field):
+                setattr(self, field, sys.intern(value) if field == 'uploader' else value)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {field: getattr(self, field) for field in self.FIELDS if getattr(self, field)}
+
+class Track:
+    """A queue entry: shared video metadata plus who requested it, and where"""
+    __slots__ = ('meta', 'requester_id', 'channel_id')
+
+    def __init__(self, meta: TrackInfo, requester_id: Optional[int] = None, channel_id: Optional[int] = None):
+        self.meta = meta
+        self.requester_id = requester_id
+        self.channel_id = channel_id
+
+    @classmethod
+    def from_info(cls, info: dict[str, Any]) -> 'Track':
+        return cls(TrackInfo.from_info(info))
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> 'Track':
+        """Inverse of to_dict()"""
+        return cls(TrackInfo.from_info(data), data.get('requester_id'), data.get('channel_id'))
+
+    def to_dict(self) -> dict[str, Any]:
+        data = self.meta.to_dict()
+        if self.requester_id is not None:
+            data['requester_id'] = self.requester_id
+        if self.channel_id is not None:
+            data['channel_id'] = self.channel_id
+        return data
+
+    @property
+    def id(self) -> Optional[str]:
+        return self.meta.id
+
+    @property
+    def title(self) -> str:
+        return self.meta.title or 'Unknown'
+
+    @property
+    def duration(self) -> int:
+        return self.meta.duration or 0
+
+    @property
+    def url(self) -> str:
+        return self.meta.webpage_url or ''
+
+    @property
+    def uploader(self) -> Optional[str]:
+        return self.meta.uploader
+
+    @property
+    def uploader_url(self) -> Optional[str]:
+        return self.meta.uploader_url
+
+    @property
+    def thumbnail(self) -> Optional[str]:
+        return self.meta.thumbnail
+
+    def __repr__(self) -> str:
+        return f'Track(id={self.id!r}, title={self.title!r}, requester_id={self.requester_id!r})'
@@ -0,0 +1,257 @@
+"""Indexed track list backing the per-guild queue"""
+import random
+from collections import Counter
+from itertools import chain, islice
+from typing import Iterable, Iterator, Union
+from core.track import Track
+
+class TrackList:
+    """
+    Chunked list of tracks with O(log n) positional lookup.
+
+    Tracks live in chunks of up to 2 * LOAD items and a Fenwick tree over the
+    chunk lengths maps a queue position to its chunk, so insert, remove and
+    move only touch a single chunk instead of copying the whole queue.
+    Total duration and per-requester counts are kept up to date as tracks
+    are added and removed, and version changes on every modification so
+    rendered views can be cached.
+    """
+    LOAD = 256
+
+    def __init__(self, tracks: Iterable[Track] = ()):
+        self._chunks: list[list[Track]] = []
+        self._durations: list[int] = []  # per-chunk duration sums
+        self._tree: list[int] = [0]
+        self._tree_dirty = False
+        self._len = 0
+        self.total_duration = 0
+        self.requester_counts: Counter[int] = Counter()
+        self.version = 0
+        self.extend(tracks)
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __bool__(self) -> bool:
+        return self._len > 0
+
+    def __iter__(self) -> Iterator[Track]:
+        return chain.from_iterable(self._chunks)
+
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._len)
+            if step != 1:
+                return list(self)[index]
+            return self.view(start, stop)
+        chunk, offset = self._locate(self._position(index))
+        return self._chunks[chunk][offset]
+
+    def view(self, start: int, stop: int) -> list[Track]:
+        """Tracks in [start, stop) without walking the chunks before start"""
+        start, stop = max(0, start), min(stop, self._len)
+        if start >= stop:
+            return []
+        chunk, offset = self._locate(start)
+        rest = (self._chunks[i] for i in range(chunk + 1, len(self._chunks)))
+        return list(islice(chain(self._chunks[chunk][offset:], chain.from_iterable(rest)), stop - start))
+
+    def append(self, track: Track) -> None:
+        self.insert(self._len, track)
+
+    def extend(self, tracks: Iterable[Track]) -> None:
+        tracks = list(tracks)
+        if not tracks:
+            return
+        start = 0
+        if self._chunks and len(self._chunks[-1]) < self.LOAD:
+            start = self.LOAD - len(self._chunks[-1])
+            self._chunks[-1].extend(tracks[:start])
+            self._refresh(len(self._chunks) - 1)
+        for i in range(start, len(tracks), self.LOAD):
+            self._chunks.append(tracks[i:i + self.LOAD])
+            self._durations.append(0)
+            self._refresh(len(self._chunks) - 1)
+        self._len += len(tracks)
+        self._tree_dirty = True
+        self._count(tracks, 1)
+
+    def insert(self, index: int, track: Track) -> None:
+        """Insert before index (clamped to the list bounds, like list.insert)"""
+        index = min(max(0, index if index >= 0 else self._len + index), self._len)
+        if not self._chunks:
+            self.extend([track])
+            return
+        if index == self._len:
+            chunk = len(self._chunks) - 1
+            self._chunks[chunk].append(track)
+        else:
+            chunk, offset = self._locate(index)
+            self._chunks[chunk].insert(offset, track)
+        self._len += 1
+        self._tree_add(chunk, 1)
+        self._refresh(chunk)
+        self._count((track,), 1)
+        if len(self._chunks[chunk]) > 2 * self.LOAD:
+            self._split(chunk)
+
+    def pop(self, index: int = -1) -> Track:
+        chunk, offset = self._locate(self._position(index))
+        track = self._chunks[chunk].pop(offset)
+        self._len -= 1
+        if self._chunks[chunk]:
+            self._tree_add(chunk, -1)
+            self._refresh(chunk)
+            if len(self._chunks[chunk]) < self.LOAD // 4:
+                self._merge(chunk)
+        else:
+            self._drop_chunk(chunk)
+        self._count((track,), -1)
+        return track
+
+    def popleft(self) -> Track:
+        return self.pop(0)
+
+    def move(self, source: int, destination: int) -> Track:
+        """Move the track at source so it ends up at destination"""
+        track = self.pop(source)
+        self.insert(destination, track)
+        return track
+
+    def remove_range(self, start: int, stop: int) -> list[Track]:
+        """Remove and return tracks in [start, stop); whole chunks are dropped at once"""
+        start, stop = max(0, start), min(stop, self._len)
+        if start >= stop:
+            return []
+        chunk, offset = self._locate(start)
+        removed: list[Track] = []
+        remaining = stop - start
+        while remaining:
+            items = self._chunks[chunk]
+            taken = items[offset:offset + remaining]
+            del items[offset:offset + remaining]
+            removed.extend(taken)
+            remaining -= len(taken)
+            if items:
+                self._refresh(chunk)
+                chunk, offset = chunk + 1, 0
+            else:
+                self._drop_chunk(chunk)
+                offset = 0
+        self._len -= len(removed)
+        self._tree_dirty = True
+        self._count(removed, -1)
+        return removed
+
+    def clear(self) -> None:
+        self._chunks.clear()
+        self._durations.clear()
+        self._tree = [0]
+        self._tree_dirty = False
+        self._len = 0
+        self.total_duration = 0
+        self.requester_counts.clear()
+        self.version += 1
+
+    def refresh(self, track: Track, title_changed: bool = False) -> None:
+        """Pick up metadata filled in after the track was queued (e.g. by a resolve)"""
+        # Resolved tracks are near the front, so this rarely looks past the first chunk
+        for chunk, items in enumerate(self._chunks):
+            if any(item is track for item in items):
+                break
+        else:
+            return
+        duration = self._durations[chunk]
+        self._refresh(chunk)
+        if title_changed or self._durations[chunk] != duration:
+            # Only titles and the total duration are rendered from the list
+            self.version += 1
+
+    def shuffle(self) -> None:
+        tracks = list(self)
+        random.shuffle(tracks)
+        self.clear()
+        self.extend(tracks)
+
+    def _position(self, index: int) -> int:
+        position = index + self._len if index < 0 else index
+        if not 0 <= position < self._len:
+            raise IndexError('track index out of range')
+        return position
+
+    def _locate(self, position: int) -> tuple[int, int]:
+        """Map a position to (chunk, offset) by descending the Fenwick tree"""
+        if self._tree_dirty:
+            self._rebuild()
+        tree = self._tree
+        chunk, remaining = 0, position
+        step = 1 << (len(tree) - 1).bit_length()
+        while step:
+            nxt = chunk + step
+            if nxt < len(tree) and tree[nxt] <= remaining:
+                chunk = nxt
+                remaining -= tree[nxt]
+            step >>= 1
+        return chunk, remaining
+
+    def _rebuild(self) -> None:
+        tree = [0] * (len(self._chunks) + 1)
+        for i, items in enumerate(self._chunks, 1):
+            tree[i] += len(items)
+            parent = i + (i & -i)
+            if parent < len(tree):
+                tree[parent] += tree[i]
+        self._tree = tree
+        self._tree_dirty = False
+
+    def _tree_add(self, chunk: int, delta: int) -> None:
+        if self._tree_dirty:
+            return
+        i = chunk + 1
+        while i < len(self._tree):
+            self._tree[i] += delta
+            i += i & -i
+
+    def _refresh(self, chunk: int) -> None:
+        # Re-summing one chunk also picks up durations filled in after queueing
+        duration = sum(track.duration for track in self._chunks[chunk])
+        self.total_duration += duration - self._durations[chunk]
+        self._durations[chunk] = duration
+
+    def _split(self, chunk: int) -> None:
+        items = self._chunks[chunk]
+        half = len(items) // 2
+        self._chunks[chunk:chunk + 1] = [items[:half], items[half:]]
+        self._durations[chunk:chunk + 1] = [self._durations[chunk], 0]
+        self._refresh(chunk)
+        self._refresh(chunk + 1)
+        self._tree_dirty = True
+
+    def _merge(self, chunk: int) -> None:
+        """Fold a near-empty chunk into a neighbour so chunks don't fragment"""
+        neighbour = chunk + 1 if chunk + 1 < len(self._chunks) else chunk - 1
+        if neighbour < 0 or len(self._chunks[chunk]) + len(self._chunks[neighbour]) > 2 * self.LOAD:
+            return
+        first, second = sorted((chunk, neighbour))
+        self._chunks[first].extend(self._chunks[second])
+        self._durations[first] += self._durations[second]
+        del self._chunks[second]
+        del self._durations[second]
+        self._tree_dirty = True
+
+    def _drop_chunk(self, chunk: int) -> None:
+        self.total_duration -= self._durations[chunk]
+        del self._chunks[chunk]
+        del self._durations[chunk]
+        self._tree_dirty = True
+
+    def _count(self, tracks: Iterable[Track], delta: int) -> None:
+        # Every add/remove path ends here
+        self.version += 1
+        counts = self.requester_counts
+        for track in tracks:
+            if track.requester_id is None:
+                continue
+            counts[track.requester_id] += delta
+            if counts[track.requester_id] <= 0:
+                del counts[track.requester_id]
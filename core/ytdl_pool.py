@@ -0,0 +1,91 @@
+"""Pool of YoutubeDL instances"""
+import logging
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Iterator
+
+if TYPE_CHECKING:
+    import yt_dlp
+
+logger = logging.getLogger("musicbot")
+
+class PooledYTDL:
+    """A YoutubeDL instance checked out of the pool"""
+    __slots__ = ('ydl', 'uses')
+
+    def __init__(self, ydl: 'yt_dlp.YoutubeDL'):
+        self.ydl = ydl
+        self.uses = 0
+
+class YTDLPool:
+    """
+    Independently configured YoutubeDL instances, one per executor task.
+    YoutubeDL keeps mutable per-request state and isn't thread-safe, so an
+    instance is never shared between concurrent jobs. Instances are recycled
+    after max_uses to cap memory growth.
+    """
+
+    def __init__(self, options: dict[str, Any], *, size: int, max_uses: int):
+        self.options = options
+        self.size = max(1, size)
+        self.max_uses = max_uses
+        self._idle: deque[PooledYTDL] = deque()
+        self._lock = threading.Lock()
+        self.created = 0
+        self.recycled = 0
+
+    def _create(self) -> PooledYTDL:
+        # Imported on first use: yt-dlp is the slowest import in the bot and only music needs it
+        import yt_dlp
+        self.created += 1
+        return PooledYTDL(yt_dlp.YoutubeDL(dict(self.options)))  # type: ignore[arg-type]
+
+    def warm_up(self) -> None:
+        """Pre-create instances so the first requests don't pay construction cost"""
+        with self._lock:
+            missing = self.size - len(self._idle)
+        instances = [self._create() for _ in range(missing)]
+        with self._lock:
+            self._idle.extend(instances)
+        logger.info(f"YoutubeDL pool warmed up with {self.size} instance(s)")
+
+    def acquire(self) -> PooledYTDL:
+        """Take an idle instance, creating one if all are busy (call from an executor thread)"""
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        return self._create()
+
+    def release(self, pooled: PooledYTDL) -> None:
+        pooled.uses += 1
+        with self._lock:
+            keep = pooled.uses < self.max_uses and len(self._idle) < self.size
+            if keep:
+                self._idle.append(pooled)
+        if not keep:
+            self.recycled += 1
+            self._close(pooled)
+
+    @contextmanager
+    def checkout(self) -> Iterator['yt_dlp.YoutubeDL']:
+        pooled = self.acquire()
+        try:
+            yield pooled.ydl
+        finally:
+            self.release(pooled)
+
+    def extract_info(self, url: str, **kwargs: Any) -> Any:
+        """Run extract_info on a checked-out instance (call from an executor thread)"""
+        with self.checkout() as ydl:
+            return ydl.extract_info(url, **kwargs)
+
+    @staticmethod
+    def _close(pooled: PooledYTDL) -> None:
+        try:
+            pooled.ydl.close()
+        except Exception:
+            logger.debug("Failed to close YoutubeDL instance", exc_info=True)
+
+    def stats(self) -> dict[str, int]:
+        return {'idle': len(self._idle), 'created': self.created, 'recycled': self.recycled}
@@ -2,37 +2,297 @@
 import asyncio
 import functools
 import logging
+import re
+import time
 import concurrent.futures
-from dataclasses import dataclass
-from typing import Any
+import multiprocessing
+import weakref
+from itertools import islice
+from typing import Any, AsyncIterator, Iterator, Optional
 import discord
-import yt_dlp
 from config.settings import Config
-from utils.errors import YTDLError
+from utils.errors import SchedulerOverloadedError, YTDLError
 from core.spotify_handler import SpotifyHandler
+from core.cache import TTLCache, stream_expiry
+from core.resolution_cache import ResolutionCache, query_key, spotify_key
+from core.ytdl_pool import PooledYTDL, YTDLPool
+from core import ytdl_worker
+from core.track import Track
+from core.metrics import REGISTRY
+from core.single_flight import SingleFlight
+from core.audio_cache import AudioCache
+from core.loudness import LoudnessIndex
+from core.scheduler import FairScheduler, Priority, current_guild, priority_floor
 
 logger = logging.getLogger("musicbot")
 
 _YTDL_EXECUTOR = concurrent.futures.ThreadPoolExecutor(max_workers=Config.YTDL_MAX_WORKERS)
-_SPOTIFY_HANDLER = SpotifyHandler()
+# Decides which job gets the next free worker; the executors themselves never queue much
+_SCHEDULER = FairScheduler(
+    Config.YTDL_MAX_WORKERS,
+    max_waiting=Config.YTDL_QUEUE_LIMIT,
+    max_waiting_per_guild=Config.YTDL_GUILD_QUEUE_LIMIT
+)
+# Optional process pool for GIL-bound single extractions (YTDL_EXECUTOR_MODE=process);
+# created on first use by YTDLSource._process_executor()
+_YTDL_PROCESS_EXECUTOR: Optional[concurrent.futures.ProcessPoolExecutor] = None
+# Created by _spotify() on the first search, not at import
+_SPOTIFY_HANDLER: Optional[SpotifyHandler] = None
+_STREAM_CACHE = TTLCache(max_size=Config.STREAM_CACHE_SIZE, ttl=Config.STREAM_CACHE_TTL)
+# Hot search resolutions (normalized query / Spotify ID -> compact track info), checked before SQLite
+_SEARCH_CACHE = TTLCache(max_size=Config.SEARCH_CACHE_SIZE, ttl=Config.SEARCH_CACHE_TTL)
+# Identical searches/stream extractions running at the same time share one executor job
+_INFLIGHT = SingleFlight()
+_RESOLUTION_CACHE = ResolutionCache(
+    Config.RESOLUTION_CACHE_PATH,
+    ttl=Config.RESOLUTION_CACHE_TTL,
+    max_entries=Config.RESOLUTION_CACHE_MAX
+)
+# Popular tracks kept as local Opus files (disabled unless AUDIO_CACHE_MAX_MB is set)
+_AUDIO_CACHE = AudioCache(
+    Config.AUDIO_CACHE_DIR,
+    max_bytes=Config.AUDIO_CACHE_MAX_MB * 1024 * 1024,
+    min_plays=Config.AUDIO_CACHE_MIN_PLAYS
+)
+# Measured loudness per video, applied as a static gain (disabled unless LOUDNESS_NORMALIZE is set)
+_LOUDNESS = LoudnessIndex(
+    Config.LOUDNESS_INDEX_PATH if Config.LOUDNESS_NORMALIZE else None,
+    target=Config.LOUDNESS_TARGET,
+    max_boost=Config.LOUDNESS_MAX_BOOST,
+    workers=Config.LOUDNESS_WORKERS
+)
 
-@dataclass
-class Track:
-    info: dict[str, Any]
+# Anything that isn't a URL or an explicit "xxsearch:" query is free text
+_URL_RE = re.compile(r'^(?:[a-z][a-z0-9+.-]*://|[^\s/]+\.[^\s/]+/|[a-z]+search\d*:)', re.IGNORECASE)
+# Keep a margin so a cached URL doesn't expire while the track is still playing
+_STREAM_EXPIRY_MARGIN = 60
+
+# Playback paths: PCM (decoded, volume scaled in Python) or Opus passthrough
+AUDIO_MODES = ('pcm', 'opus')
+
+# Playlist entries pulled from the lazy yt-dlp generator per executor job
+_PLAYLIST_CHUNK = 50
+
+# Seconds of audio per read() (one 20 ms Opus/PCM frame)
+_FRAME_SECONDS = discord.opus.Encoder.FRAME_LENGTH / 1000
+# A stream that runs out this long before the track's end was cut off, not finished
+_RESUME_TOLERANCE = 10
+
+# Sources created so far, for counting live FFmpeg processes
+_SOURCES: 'weakref.WeakSet[TrackSource]' = weakref.WeakSet()
+
+_EXTRACT_SECONDS = REGISTRY.histogram(
+    'musicbot_extract_info_seconds', 'yt-dlp extraction latency (search/playlist or single stream)', ('kind',)
+)
+_CREATE_SOURCE_SECONDS = REGISTRY.histogram(
+    'musicbot_create_source_seconds', 'Time to resolve a track and spawn FFmpeg'
+)
+_YTDL_BUSY = REGISTRY.gauge(
+    'musicbot_ytdl_executor_busy_workers', 'yt-dlp jobs currently running', ('executor',)
+)
+REGISTRY.gauge(
+    'musicbot_ytdl_executor_queue_depth', 'yt-dlp jobs waiting for a free thread',
+    collector=lambda: [({}, _YTDL_EXECUTOR._work_queue.qsize())]
+)
+REGISTRY.gauge(
+    'musicbot_ytdl_executor_max_workers', 'Configured yt-dlp workers (YTDL_MAX_WORKERS)',
+    collector=lambda: [({}, Config.YTDL_MAX_WORKERS)]
+)
+_SCHEDULER_WAIT_SECONDS = REGISTRY.histogram(
+    'musicbot_ytdl_scheduler_wait_seconds', 'Time yt-dlp jobs waited for a worker', ('priority',)
+)
+REGISTRY.gauge(
+    'musicbot_ytdl_scheduler_waiting', 'yt-dlp jobs waiting for a worker', ('priority',),
+    collector=lambda: [({'priority': p.name.lower()}, _SCHEDULER.waiting(p)) for p in Priority]
+)
+REGISTRY.counter(
+    'musicbot_ytdl_scheduler_rejected_total', 'yt-dlp jobs turned away because too many were waiting', ('priority',),
+    collector=lambda: [({'priority': p.name.lower()}, _SCHEDULER.rejected[p]) for p in Priority]
+)
+REGISTRY.gauge(
+    'musicbot_ffmpeg_processes', 'Running FFmpeg child processes',
+    collector=lambda: [({}, sum(1 for source in list(_SOURCES) if source.ffmpeg_running))]
+)
+
+def _spotify() -> SpotifyHandler:
+    global _SPOTIFY_HANDLER
+    if _SPOTIFY_HANDLER is None:
+        _SPOTIFY_HANDLER = SpotifyHandler()
+    return _SPOTIFY_HANDLER
+
+def _take(entries: Iterator[Any], count: int) -> list[Any]:
+    return list(islice(entries, count))
+
+def _extract_held(pool: YTDLPool, held: list[PooledYTDL], target: str) -> Any:
+    # Checked out inside the admitted job, so waiting for an instance never bypasses the
+    # scheduler; instances held at once are bounded by its slots and waiting limit
+    pooled = pool.acquire()
+    held.append(pooled)
+    return pooled.ydl.extract_info(target, download=False, process=False)
+
+def _is_text_query(query: str) -> bool:
+    return not _URL_RE.match(query.strip())
+
+def _copy_search(result: tuple[list[Track], list[str]]) -> tuple[list[Track], list[str]]:
+    # Fresh queue entries per caller (requester/channel differ); the metadata stays shared
+    tracks, errors = result
+    return [Track(track.meta) for track in tracks], list(errors)
+
+def _counted(func, *args):
+    with _YTDL_BUSY.track_inprogress(executor='thread'):
+        return func(*args)
+
+async def _run_ytdl(loop, process_executor, priority: Priority, func, *args):
+    """
+    Run a yt-dlp job on the process pool if given, otherwise the thread pool,
+    once the scheduler admits it
+    """
+    guild_id = current_guild.get()
+    priority = max(priority, priority_floor.get())
+    waited = await _SCHEDULER.acquire(priority, guild_id)
+    _SCHEDULER_WAIT_SECONDS.observe(waited, priority=priority.name.lower())
+    try:
+        if process_executor:
+            future = process_executor.submit(func, *args)
+        else:
+            future = _YTDL_EXECUTOR.submit(_counted, func, *args)
+    except BaseException:
+        _SCHEDULER.release()
+        raise
+    # The slot is held until the worker is actually free, even if the caller gives up
+    future.add_done_callback(lambda _: loop.call_soon_threadsafe(_SCHEDULER.release))
+    if process_executor:
+        with _YTDL_BUSY.track_inprogress(executor='process'):
+            return await asyncio.wrap_future(future, loop=loop)
+    return await asyncio.wrap_future(future, loop=loop)
+
+class _StderrWatcher:
+    """File-like sink for FFmpeg's stderr that remembers HTTP 403 responses"""
+    
+    def __init__(self):
+        self.forbidden = False
+        self._tail = b''
+    
+    def write(self, data: bytes) -> int:
+        # Keep a short tail so a message split across reads is still matched
+        chunk = self._tail + data
+        if b'403' in chunk and b'Forbidden' in chunk:
+            self.forbidden = True
+        self._tail = data[-64:]
+        for line in data.decode(errors='ignore').splitlines():
+            if line.strip():
+                logger.debug(f"FFmpeg: {line.strip()}")
+        return len(data)
+
+class TrackSource:
+    """Track metadata shared by the PCM and Opus playback sources"""
+    
+    def _init_track(self, track: Track, stream: dict[str, Any], stderr: Optional[_StderrWatcher], start: float = 0.0) -> None:
+        # Only the compact queue entry and stream fields are kept, never the full info dict
+        self.track = track
+        self.stream = stream
+        # Not _stderr: FFmpegAudio keeps its stderr pipe there and clears it on cleanup
+        self._stderr_watcher = stderr
+        # Playback position: where FFmpeg was started plus the frames handed to the player
+        self.start = start
+        self._frames = 0
+        self.exhausted = False
+        # Times this track was restarted after its stream was cut off
+        self.resumes = 0
+        _SOURCES.add(self)
+    
+    def read(self) -> bytes:
+        data = super().read()
+        if data:
+            self._frames += 1
+        else:
+            self.exhausted = True
+        return data
+    
+    @property
+    def position(self) -> float:
+        """Seconds into the track that have been played"""
+        return self.start + self._frames * _FRAME_SECONDS
+    
+    @property
+    def interrupted(self) -> bool:
+        """True if the stream ran out well before the end of the track (expired URL, dropped connection)"""
+        return (
+            self.exhausted
+            and bool(self.duration)
+            and not self.stream.get('is_live')
+            and self.position < self.duration - _RESUME_TOLERANCE
+        )
     
     @property
     def title(self) -> str:
-        return self.info.get('title', 'Unknown')
+        return self.track.title
+    
+    @property
+    def url(self) -> str:
+        return self.track.url
     
     @property
     def duration(self) -> int:
-        return self.info.get('duration') or 0
+        return self.track.duration
     
     @property
-    def url(self) -> str:
-        return self.info.get('webpage_url') or self.info.get('url') or ''
+    def uploader(self) -> Optional[str]:
+        return self.track.uploader
+    
+    @property
+    def uploader_url(self) -> Optional[str]:
+        return self.track.uploader_url
+    
+    @property
+    def thumbnail(self) -> Optional[str]:
+        return self.track.thumbnail
+    
+    @property
+    def ffmpeg_running(self) -> bool:
+        # PCM sources wrap the FFmpeg audio in a volume transformer
+        process = getattr(getattr(self, 'original', self), '_process', None)
+        poll = getattr(process, 'poll', None)
+        return poll is not None and poll() is None
+    
+    @property
+    def stream_forbidden(self) -> bool:
+        """True if FFmpeg was refused the stream URL (expired or revoked)"""
+        return bool(self._stderr_watcher and self._stderr_watcher.forbidden)
+
+class OpusTrackSource(TrackSource, discord.FFmpegOpusAudio):
+    """
+    Opus output straight from FFmpeg, skipping PCM decoding in Python and
+    re-encoding in the player thread. Opus input at unity volume is copied
+    as-is; otherwise FFmpeg applies the volume filter (times the loudness
+    gain) and encodes.
+    """
+    
+    def __init__(
+        self,
+        track: Track,
+        stream: dict[str, Any],
+        *,
+        volume: float,
+        before_options: str,
+        stderr=None,
+        start: float = 0.0,
+        gain: float = 1.0
+    ):
+        # Passthrough is an explicit choice to skip encoding, so it wins over normalization
+        self.passthrough = stream.get('acodec') == 'opus' and volume == 1.0
+        options = '-vn' if self.passthrough else f'-vn -af volume={volume * gain:.4f}'
+        super().__init__(
+            stream['url'],
+            codec='copy' if self.passthrough else None,
+            bitrate=min(int(stream.get('abr') or 128), 128),
+            before_options=before_options,
+            options=options,
+            stderr=stderr
+        )
+        self._init_track(track, stream, stderr, start)
 
-class YTDLSource(discord.PCMVolumeTransformer):
+class YTDLSource(TrackSource, discord.PCMVolumeTransformer):
     ytdl_options = {
         'format': 'bestaudio/best',
         'outtmpl': '%(extractor)s-%(id)s-%(title)s.%(ext)s',
@@ -53,19 +313,80 @@ class YTDLSource(discord.PCMVolumeTransformer):
         'options': '-vn -q:a 5'
     }
     
-    ytdl = yt_dlp.YoutubeDL(ytdl_options)  # type: ignore[arg-type]
+    # One YoutubeDL per executor task instead of a single shared instance
+    ytdl_pool = YTDLPool(ytdl_options, size=Config.YTDL_MAX_WORKERS, max_uses=Config.YTDL_RECYCLE_AFTER)
     
-    def __init__(self, source, *, data, volume=0.5):
+    def __init__(self, source, *, track: Track, stream: dict[str, Any], volume=0.5, stderr=None, start: float = 0.0):
         super().__init__(source, volume)
-        self.data = data
-        self.requester = data.get('requester')
-        self.channel = data.get('channel')
-        self.title = data.get('title')
-        self.url = data.get('webpage_url')
-        self.duration = data.get('duration') or 0
-        self.uploader = data.get('uploader')
-        self.uploader_url = data.get('uploader_url')
-        self.thumbnail = data.get('thumbnail')
+        self._init_track(track, stream, stderr, start)
+    
+    @classmethod
+    def forget_stream(cls, video_id: str) -> None:
+        """Evict a cached stream URL, e.g. after FFmpeg got a 403"""
+        if video_id and _STREAM_CACHE.invalidate(video_id):
+            logger.info(f"Evicted cached stream URL for {video_id}")
+    
+    @classmethod
+    def _process_executor(cls) -> Optional[concurrent.futures.ProcessPoolExecutor]:
+        """Worker processes with a long-lived YoutubeDL each, if process mode is enabled"""
+        global _YTDL_PROCESS_EXECUTOR
+        if Config.YTDL_EXECUTOR_MODE != 'process':
+            return None
+        if _YTDL_PROCESS_EXECUTOR is None:
+            _YTDL_PROCESS_EXECUTOR = concurrent.futures.ProcessPoolExecutor(
+                max_workers=Config.YTDL_MAX_WORKERS,
+                # Never fork the running bot: its threads and sockets must not leak into workers
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=ytdl_worker.init_worker,
+                initargs=(cls.ytdl_options, Config.YTDL_RECYCLE_AFTER)
+            )
+            logger.info(f"Using process-pool yt-dlp backend with {Config.YTDL_MAX_WORKERS} worker(s)")
+        return _YTDL_PROCESS_EXECUTOR
+    
+    @classmethod
+    async def warm_up(cls, *, loop=None) -> None:
+        """Pre-create pooled YoutubeDL instances (or worker processes) off the event loop"""
+        loop = loop or asyncio.get_event_loop()
+        await _AUDIO_CACHE.load()
+        await loop.run_in_executor(_YTDL_EXECUTOR, cls.ytdl_pool.warm_up)
+        executor = cls._process_executor()
+        if executor:
+            # Submitting one no-op job per worker spawns them all up front
+            await asyncio.gather(*(
+                loop.run_in_executor(executor, int) for _ in range(Config.YTDL_MAX_WORKERS)
+            ))
+    
+    @classmethod
+    async def close(cls) -> None:
+        """Release pooled network resources"""
+        global _YTDL_PROCESS_EXECUTOR
+        if _SPOTIFY_HANDLER is not None:
+            await _SPOTIFY_HANDLER.close()
+        await _RESOLUTION_CACHE.close()
+        await _AUDIO_CACHE.close()
+        await _LOUDNESS.close()
+        if _YTDL_PROCESS_EXECUTOR is not None:
+            _YTDL_PROCESS_EXECUTOR.shutdown(wait=False, cancel_futures=True)
+            _YTDL_PROCESS_EXECUTOR = None
+    
+    @classmethod
+    def purge_expired(cls) -> int:
+        """Drop expired entries from the in-memory caches"""
+        return _STREAM_CACHE.purge_expired() + _SEARCH_CACHE.purge_expired()
+    
+    @classmethod
+    def cache_stats(cls) -> dict[str, dict[str, Any]]:
+        """Counters for the resolution caches"""
+        return {
+            'stream': _STREAM_CACHE.stats(),
+            'search': _SEARCH_CACHE.stats(),
+            'in_flight': _INFLIGHT.stats(),
+            'resolution': _RESOLUTION_CACHE.stats(),
+            'audio': _AUDIO_CACHE.stats(),
+            'loudness': _LOUDNESS.stats(),
+            'ytdl_pool': cls.ytdl_pool.stats(),
+            'scheduler': _SCHEDULER.stats(),
+        }
     
     @classmethod
     async def search(cls, query: str, *, loop=None) -> tuple[list[Track], list[str]]:
@@ -73,10 +394,23 @@ class YTDLSource(discord.PCMVolumeTransformer):
         Search and return metadata only (lightweight)
         Resolve Spotify URLs if applicable
         """
+        all_tracks = []
+        all_errors = []
+        async for tracks, errors in cls.iter_search(query, loop=loop):
+            all_tracks.extend(tracks)
+            all_errors.extend(errors)
+        return all_tracks, all_errors
+    
+    @classmethod
+    async def iter_search(cls, query: str, *, loop=None) -> AsyncIterator[tuple[list[Track], list[str]]]:
+        """
+        Like search(), but yield (tracks, errors) batches as soon as they are resolved,
+        so playback can start before a large playlist is fully ingested
+        """
         loop = loop or asyncio.get_event_loop()
 
         # Check if it's a Spotify URL
-        if _SPOTIFY_HANDLER.is_spotify_url(query):
+        if _spotify().is_spotify_url(query):
             if not Config.has_spotify():
                 raise YTDLError(
                     "Spotify support not configured. "
@@ -85,76 +419,260 @@ class YTDLSource(discord.PCMVolumeTransformer):
             
             try:
                 # Resolve Spotify URL to YouTube search queries
-                search_queries = await _SPOTIFY_HANDLER.resolve(query)
-                logger.info(f"Resolved Spotify URL to {len(search_queries)} search queries")
+                entries = await _spotify().resolve_entries(query)
+                logger.info(f"Resolved Spotify URL to {len(entries)} search queries")
             except Exception as e:
                 logger.exception("Spotify resolution failed")
                 raise YTDLError(f"Failed to resolve Spotify URL: {e}")
             
             # Search YouTube for each resolved query
-            all_tracks = []
-            all_errors = []
+            found = False
+            async for tracks, errors in cls._iter_many(
+                [entry.query for entry in entries],
+                loop,
+                spotify_ids=[entry.track_id for entry in entries]
+            ):
+                found = found or bool(tracks)
+                yield tracks, errors
             
-            for search_query in search_queries:
-                try:
-                    tracks, errors = await cls._search_youtube(search_query, loop)
-                    # Only take the first (best) result for each Spotify track
-                    if tracks:
-                        all_tracks.append(tracks[0])
-                    all_errors.extend(errors)
-                except YTDLError as e:
-                    all_errors.append(f"{search_query}: {str(e)}")
-                    continue
-            
-            if not all_tracks:
+            if not found:
                 raise YTDLError("Could not find any tracks from Spotify URL on YouTube")
-            
-            return all_tracks, all_errors
+            return
         
-        # Regular YouTube search
-        return await cls._search_youtube(query, loop)
+        # Free-text search, answered from the in-memory or persistent cache when possible
+        if _is_text_query(query):
+            key = query_key(query)
+            cached = _SEARCH_CACHE.get(key)
+            if cached is None:
+                cached = await _RESOLUTION_CACHE.get(key)
+                if cached:
+                    _SEARCH_CACHE.put(key, cached)
+            if cached:
+                yield [Track.from_info(cached)], []
+                return
+            tracks, errors = await cls._search_youtube(query, loop)
+            if tracks:
+                info = tracks[0].meta.to_dict()
+                _SEARCH_CACHE.put(key, info)
+                await _RESOLUTION_CACHE.put_many({key: info})
+            yield tracks, errors
+            return
+        
+        # Regular YouTube URL
+        async for batch in cls._iter_youtube(query, loop):
+            yield batch
     
     @classmethod
-    async def _search_youtube(cls, query: str, loop) -> tuple[list[Track], list[str]]:
-        """Internal method for YouTube search"""
-        partial = functools.partial(cls.ytdl.extract_info, query, download=False, process=False)
-        
-        try:
-            data = await loop.run_in_executor(_YTDL_EXECUTOR, partial)
-        except Exception as e:
-            logger.exception("YTDL search failed")
-            raise YTDLError(f"Search failed: {e}")
+    async def _search_many(
+        cls,
+        queries: list[str],
+        loop,
+        spotify_ids: Optional[list[Optional[str]]] = None
+    ) -> tuple[list[Track], list[str]]:
+        """Resolve queries concurrently, keeping the first result of each"""
+        all_tracks = []
+        all_errors = []
+        async for tracks, errors in cls._iter_many(queries, loop, spotify_ids):
+            all_tracks.extend(tracks)
+            all_errors.extend(errors)
+        return all_tracks, all_errors
+    
+    @classmethod
+    async def _iter_many(
+        cls,
+        queries: list[str],
+        loop,
+        spotify_ids: Optional[list[Optional[str]]] = None
+    ) -> AsyncIterator[tuple[list[Track], list[str]]]:
+        """
+        Resolve queries concurrently (bounded), yielding the first result of each.
+        Results and errors keep the order of the input queries.
+        Previously resolved queries are answered from the in-memory search cache,
+        then from the resolution cache in one bulk lookup.
+        """
+        spotify_ids = spotify_ids or [None] * len(queries)
+        keys = [
+            ([spotify_key(sid)] if sid else []) + [query_key(q)]
+            for q, sid in zip(queries, spotify_ids)
+        ]
+        all_keys = list(dict.fromkeys(key for search_keys in keys for key in search_keys))
+        cached = {}
+        for key in all_keys:
+            info = _SEARCH_CACHE.get(key)
+            if info is not None:
+                cached[key] = info
+        stored = await _RESOLUTION_CACHE.get_many([key for key in all_keys if key not in cached])
+        for key, info in stored.items():
+            _SEARCH_CACHE.put(key, info)
+        cached.update(stored)
+        semaphore = asyncio.Semaphore(max(1, Config.SPOTIFY_RESOLVE_CONCURRENCY))
         
-        if not data:
-            raise YTDLError(f"No results for: {query}")
+        async def search_one(index: int, search_query: str, search_keys: list[str]) -> tuple[list[Track], list[str]]:
+            hit = next((cached[key] for key in search_keys if key in cached), None)
+            if hit:
+                return [Track.from_info(hit)], []
+            if index > 0:
+                # The first track keeps the caller's priority so playback can start;
+                # each search runs in its own task, so this only affects the import
+                priority_floor.set(Priority.BULK)
+            async with semaphore:
+                try:
+                    return await cls._search_youtube(search_query, loop)
+                except YTDLError as e:
+                    return [], [f"{search_query}: {str(e)}"]
         
+        tasks = [asyncio.ensure_future(search_one(i, q, k)) for i, (q, k) in enumerate(zip(queries, keys))]
+        fresh = {}
+        try:
+            for search_keys, task in zip(keys, tasks):
+                tracks, errors = await task
+                if tracks:
+                    # Remember new resolutions under every key that missed
+                    info = tracks[0].meta.to_dict()
+                    fresh.update({key: info for key in search_keys if key not in cached})
+                # Only take the first (best) result for each Spotify track
+                yield tracks[:1], errors
+        finally:
+            for task in tasks:
+                task.cancel()
+            for key, info in fresh.items():
+                _SEARCH_CACHE.put(key, info)
+            await _RESOLUTION_CACHE.put_many(fresh)
+    
+    @classmethod
+    async def _search_youtube(cls, query: str, loop) -> tuple[list[Track], list[str]]:
+        """Internal method for YouTube search; concurrent identical searches run once"""
+        key = ('search', query_key(query) if _is_text_query(query) else query.strip())
+        return await _INFLIGHT.do(key, lambda: cls._run_search(query, loop), copy=_copy_search)
+    
+    @classmethod
+    async def _run_search(cls, query: str, loop) -> tuple[list[Track], list[str]]:
         tracks = []
         errors = []
+        async for batch_tracks, batch_errors in cls._iter_youtube(query, loop):
+            tracks.extend(batch_tracks)
+            errors.extend(batch_errors)
         
-        if 'entries' in data:
-            entries = list(data.get('entries') or [])[:Config.PLAYLIST_MAX]
-            for entry in entries:
-                if entry:
-                    tracks.append(Track(info=dict(entry)))
-                else:
-                    errors.append("Empty playlist entry")
-        else:
-            tracks.append(Track(info=dict(data)))
+        if not tracks and not errors:
+            raise YTDLError(f"No results for: {query}")
         
         return tracks, errors
     
     @classmethod
-    async def create_source(cls, track: Track, *, loop=None):
-        """Create playable source from Track metadata"""
+    async def _iter_youtube(cls, query: str, loop) -> AsyncIterator[tuple[list[Track], list[str]]]:
+        """Yield YouTube results; playlist pages are pulled lazily on the executor"""
+        # Free text resolves to the single best match (with its video ID)
+        target = f'ytsearch1:{query}' if _is_text_query(query) else query
+        # Text searches return a handful of entries and can run in a worker process;
+        # playlists need a live generator and stay on the thread pool
+        process_executor = cls._process_executor() if _is_text_query(query) else None
+        # The lazy entries generator keeps using the instance, so hold it until we're done
+        held: list[PooledYTDL] = []
+        try:
+            try:
+                with _EXTRACT_SECONDS.time(kind='search'):
+                    if process_executor:
+                        data = await _run_ytdl(
+                            loop, process_executor, Priority.INTERACTIVE,
+                            ytdl_worker.extract, target, False, Config.PLAYLIST_MAX
+                        )
+                    else:
+                        data = await _run_ytdl(
+                            loop, None, Priority.INTERACTIVE, _extract_held, cls.ytdl_pool, held, target
+                        )
+            except SchedulerOverloadedError:
+                raise
+            except Exception as e:
+                logger.exception("YTDL search failed")
+                raise YTDLError(f"Search failed: {e}")
+            
+            if not data:
+                raise YTDLError(f"No results for: {query}")
+            
+            if 'entries' not in data:
+                yield [Track.from_info(data)], []
+                return
+            
+            # Entries are usually a lazy generator that downloads further pages as it
+            # is consumed, so never iterate it on the event loop
+            entries = iter(data.get('entries') or [])
+            # A search has at most one result; don't ask the generator for more
+            remaining = 1 if _is_text_query(query) else Config.PLAYLIST_MAX
+            chunk = 1  # first entry alone so playback can start right away
+            priority = Priority.INTERACTIVE
+            while remaining > 0:
+                try:
+                    batch = await _run_ytdl(loop, None, priority, _take, entries, min(chunk, remaining))
+                except SchedulerOverloadedError:
+                    raise
+                except Exception as e:
+                    logger.exception("YTDL playlist paging failed")
+                    raise YTDLError(f"Playlist loading failed: {e}")
+                if not batch:
+                    break
+                remaining -= len(batch)
+                chunk = _PLAYLIST_CHUNK
+                # The rest of the playlist yields to other guilds' playback and searches
+                priority = Priority.BULK
+                
+                tracks = [Track.from_info(entry) for entry in batch if entry]
+                errors = ["Empty playlist entry"] * (len(batch) - len(tracks))
+                yield tracks, errors
+        finally:
+            for pooled in held:
+                cls.ytdl_pool.release(pooled)
+    
+    @classmethod
+    async def resolve(cls, track: Track, *, loop=None) -> dict[str, Any]:
+        """Resolve Track metadata to compact stream info without spawning FFmpeg"""
         loop = loop or asyncio.get_event_loop()
-        webpage = track.url or f"https://www.youtube.com/watch?v={track.info.get('id')}"
+        webpage = track.url or (f"https://www.youtube.com/watch?v={track.id}" if track.id else None)
         
         if not webpage:
             raise YTDLError("No URL available")
         
-        partial = functools.partial(cls.ytdl.extract_info, webpage, download=False)
+        # Every source is created from resolved stream info, so gains and the
+        # cached file index are in memory by then
+        await _LOUDNESS.load()
+        await _AUDIO_CACHE.load()
+        
+        local = _AUDIO_CACHE.path_for(track.id)
+        if local:
+            return {'url': local, 'acodec': 'opus', 'local': True}
+        
+        cached = _STREAM_CACHE.get(track.id) if track.id else None
+        if cached:
+            return dict(cached)
+        
+        # Callers get their own copy: create_source() may add the probed codec
+        return await _INFLIGHT.do(
+            ('stream', track.id or webpage),
+            lambda: cls._fetch_stream(track, webpage, loop),
+            copy=dict
+        )
+    
+    @classmethod
+    async def _fetch_stream(cls, track: Track, webpage: str, loop) -> dict[str, Any]:
+        data = await cls._extract_stream(webpage, loop)
+        # Flat entries lack some metadata (uploader URL, thumbnail); fill it in once
+        track.meta.update(data)
+        stream = ytdl_worker.compact_info(data)
+        video_id = data.get('id') or track.id
+        if video_id:
+            _STREAM_CACHE.put(video_id, stream, expires_at=cls._stream_deadline(stream))
+        return stream
+    
+    @classmethod
+    async def _extract_stream(cls, webpage: str, loop) -> dict[str, Any]:
+        """Run full extraction for a single video"""
         try:
-            data = await loop.run_in_executor(_YTDL_EXECUTOR, partial)
+            process_executor = cls._process_executor()
+            with _EXTRACT_SECONDS.time(kind='stream'):
+                if process_executor:
+                    data = await _run_ytdl(loop, process_executor, Priority.PLAYBACK, ytdl_worker.extract, webpage)
+                else:
+                    partial = functools.partial(cls.ytdl_pool.extract_info, webpage, download=False)
+                    data = await _run_ytdl(loop, None, Priority.PLAYBACK, partial)
         except Exception as e:
             raise YTDLError(f"Failed to fetch: {e}")
         
@@ -170,14 +688,115 @@ class YTDLSource(discord.PCMVolumeTransformer):
         if 'url' not in data or not data['url']:
             raise YTDLError("No stream URL available")
         
-        # Convert to regular dict and preserve requester/channel from original track
-        data_dict = dict(data)
-        data_dict['requester'] = track.info.get('requester')
-        data_dict['channel'] = track.info.get('channel')
+        return data
+    
+    @staticmethod
+    def _stream_deadline(data: dict[str, Any]) -> Optional[float]:
+        """Latest time a cached stream URL can be used to start the whole track"""
+        expire = stream_expiry(data.get('url', ''))
+        if expire is None:
+            return None
+        return expire - (data.get('duration') or 0) - _STREAM_EXPIRY_MARGIN
+    
+    @classmethod
+    def from_data(
+        cls,
+        track: Track,
+        stream: dict[str, Any],
+        *,
+        audio_mode: str = 'pcm',
+        volume: float = Config.AUDIO_VOLUME,
+        start: float = 0.0
+    ) -> TrackSource:
+        """Spawn FFmpeg for already resolved stream info, optionally starting start seconds in"""
+        stream_url: str = stream['url']
+        gain = _LOUDNESS.gain(track.id)
+        # The reconnect flags only apply to HTTP inputs
+        before_options = '' if stream.get('local') else cls.ffmpeg_options['before_options']
+        if start > 0:
+            # Input-side seek: FFmpeg asks the server for a byte range instead of decoding from zero
+            before_options = f'{before_options} -ss {start:.2f}'.strip()
+        if audio_mode == 'opus':
+            try:
+                return OpusTrackSource(
+                    track,
+                    stream,
+                    volume=volume,
+                    before_options=before_options,
+                    stderr=_StderrWatcher(),
+                    start=start,
+                    gain=gain
+                )
+            except Exception as e:
+                # PCM path stays as the fallback
+                logger.warning(f"Opus source failed, falling back to PCM: {e}")
         
-        stream_url: str = data['url']  # type: ignore[assignment]
+        stderr = _StderrWatcher()
         try:
-            audio = discord.FFmpegPCMAudio(stream_url, before_options=cls.ffmpeg_options['before_options'], options=cls.ffmpeg_options['options'])
-            return cls(audio, data=data_dict)
+            audio = discord.FFmpegPCMAudio(stream_url, before_options=before_options, options=cls.ffmpeg_options['options'], stderr=stderr)
+            return cls(audio, track=track, stream=stream, volume=volume * gain, stderr=stderr, start=start)
         except Exception as e:
-            raise YTDLError(f"FFmpeg error: {e}")
\ No newline at end of file
+            raise YTDLError(f"FFmpeg error: {e}")
+    
+    @classmethod
+    async def create_source(
+        cls,
+        track: Track,
+        *,
+        loop=None,
+        audio_mode: str = 'pcm',
+        volume: float = Config.AUDIO_VOLUME,
+        start: float = 0.0
+    ) -> TrackSource:
+        """Create playable source from Track metadata"""
+        with _CREATE_SOURCE_SECONDS.time():
+            stream = await cls.resolve(track, loop=loop)
+            if audio_mode == 'opus' and not stream.get('acodec'):
+                # yt-dlp didn't report the codec; ask FFmpeg so Opus can be copied
+                codec, _ = await discord.FFmpegOpusAudio.probe(stream['url'])
+                stream['acodec'] = 'opus' if codec in ('opus', 'libopus') else codec
+            return cls.from_data(track, stream, audio_mode=audio_mode, volume=volume, start=start)
+    
+    @classmethod
+    async def seek_source(
+        cls,
+        source: TrackSource,
+        position: float,
+        *,
+        loop=None,
+        audio_mode: str = 'pcm',
+        volume: float = Config.AUDIO_VOLUME
+    ) -> TrackSource:
+        """
+        New source for the same track starting at position. The playing stream
+        URL is reused while it stays valid for the rest of the track, so the
+        only cost is FFmpeg's input-side seek.
+        """
+        expire = stream_expiry(source.stream.get('url', ''))
+        remaining = max(0, (source.duration or 0) - position)
+        if expire is not None and expire - time.time() < remaining + _STREAM_EXPIRY_MARGIN:
+            # Would run out before the end of the track; resolve a fresh one
+            cls.forget_stream(source.track.id)
+            return await cls.create_source(source.track, loop=loop, audio_mode=audio_mode, volume=volume, start=position)
+        return cls.from_data(source.track, source.stream, audio_mode=audio_mode, volume=volume, start=position)
+    
+    @staticmethod
+    def record_play(source: TrackSource) -> None:
+        """Count a started track towards the local audio cache and measure its loudness if new"""
+        _AUDIO_CACHE.record_play(source.track.id, source.stream, source.duration)
+        _LOUDNESS.analyze(source.track.id, source.stream, source.duration)
+
+def _cache_samples(stat: str):
+    return [
+        ({'cache': name}, stats[stat])
+        for name, stats in YTDLSource.cache_stats().items()
+        if stat in stats
+    ]
+
+REGISTRY.counter('musicbot_cache_hits_total', 'Cache hits', ('cache',), collector=lambda: _cache_samples('hits'))
+REGISTRY.counter('musicbot_cache_misses_total', 'Cache misses', ('cache',), collector=lambda: _cache_samples('misses'))
+REGISTRY.counter(
+    'musicbot_extractions_coalesced_total', 'Searches/stream extractions served by an identical in-flight job',
+    collector=lambda: [({}, _INFLIGHT.coalesced)]
+)
+REGISTRY.gauge('musicbot_cache_hit_ratio', 'Cache hit ratio since startup', ('cache',), collector=lambda: _cache_samples('hit_ratio'))
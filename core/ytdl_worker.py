@@ -0,0 +1,44 @@
+"""yt-dlp extraction for worker processes
+
+Only imports yt-dlp so worker processes start quickly, and only returns
+small picklable dicts to keep inter-process traffic low.
+"""
+from itertools import islice
+from typing import Any, Optional
+from core.ytdl_pool import YTDLPool
+
+# Fields of an info dict (or flat playlist entry) used anywhere in the bot
+COMPACT_KEYS = (
+    'id', 'title', 'url', 'webpage_url', 'duration', 'uploader', 'uploader_url',
+    'thumbnail', 'acodec', 'abr', 'asr', 'ext', 'is_live', '_type', 'ie_key',
+)
+
+_POOL: Optional[YTDLPool] = None
+
+def compact_info(info: dict[str, Any]) -> dict[str, Any]:
+    """Drop formats, headers, thumbnails lists etc. from a yt-dlp info dict"""
+    compact = {key: info[key] for key in COMPACT_KEYS if info.get(key) is not None}
+    if 'thumbnail' not in compact and info.get('thumbnails'):
+        compact['thumbnail'] = info['thumbnails'][-1].get('url')
+    return compact
+
+def init_worker(options: dict[str, Any], max_uses: int) -> None:
+    """ProcessPoolExecutor initializer: one warm YoutubeDL per worker process"""
+    global _POOL
+    _POOL = YTDLPool(options, size=1, max_uses=max_uses)
+    _POOL.warm_up()
+
+def extract(url: str, process: bool = True, limit: int = 100) -> Optional[dict[str, Any]]:
+    """Extract url and return a compact result; playlist entries are materialized up to limit"""
+    assert _POOL is not None, "init_worker() was not called"
+    with _POOL.checkout() as ydl:
+        data = ydl.extract_info(url, download=False, process=process)
+        if not data:
+            return None
+        result = compact_info(data)
+        if 'entries' in data:
+            result['entries'] = [
+                compact_info(entry) if entry else None
+                for entry in islice(data.get('entries') or [], limit)
+            ]
+        return result
@@ -1,9 +1,14 @@
+import time
+# Taken before the heavy imports so the startup report includes them
+_STARTED = time.perf_counter()
 import logging
 import platform
 import asyncio
 import discord
 from discord.ext import commands, tasks
 from config.settings import Config
+from core.metrics import REGISTRY, MetricsServer
+from core.startup import StartupTimer, sync_commands
 
 # Validate config on startup
 try:
@@ -19,6 +24,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger("musicbot")
 
+startup = StartupTimer(_STARTED)
+startup.mark('imports')
+
 # Set intents
 intents = discord.Intents.default()
 intents.members = True
@@ -64,6 +72,11 @@ async def on_guild_join(guild):
 
 @client.event
 async def on_ready():
+    # on_ready fires again after every reconnect; startup work is only done once
+    first_ready = 'connect' not in startup.phases
+    if first_ready:
+        startup.mark('connect')
+
     # Fetch application info to get owner
     if not client.owner_id:
         app_info = await client.application_info()
@@ -75,19 +88,28 @@ async def on_ready():
     logger.info(f'Discord.py: {discord.__version__}')
     logger.info(f'Platform: {platform.system()} {platform.release()}')
 
-    # Sync slash commands
-    try:
-        synced = await client.tree.sync()
-        logger.info(f'Synced {len(synced)} slash command(s)')
-    except Exception as e:
-        logger.exception(f'Failed to sync slash commands: {e}')
+    # Sync slash commands, only if they changed since the last sync
+    if first_ready:
+        try:
+            synced = await sync_commands(client.tree, Config.COMMAND_SYNC_STATE)
+            if synced is None:
+                logger.info('Slash commands unchanged, skipped sync')
+            else:
+                logger.info(f'Synced {synced} slash command(s)')
+        except Exception as e:
+            logger.exception(f'Failed to sync slash commands: {e}')
+        startup.mark('command_sync')
+        logger.info(f'Startup: {startup.report()}')
     
     if not status_task.is_running():
         status_task.start()
 
 async def main():
+    metrics = MetricsServer(REGISTRY, Config.METRICS_HOST, Config.METRICS_PORT)
     try:
+        await metrics.start()
         await load_cogs()
+        startup.mark('cogs')
         if Config.BOT_TOKEN is None:
             raise ValueError("BOT_TOKEN is not set")
         await client.start(Config.BOT_TOKEN)
@@ -98,6 +120,7 @@ async def main():
     finally:
         if not client.is_closed():
             await client.close()
+        await metrics.stop()
 
 if __name__ == '__main__':
     asyncio.run(main())
\ No newline at end of file
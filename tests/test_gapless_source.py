@@ -0,0 +1,51 @@
+import threading
+from types import SimpleNamespace
+import discord
+from discord.player import AudioPlayer
+from core.gapless_source import GaplessSource
+
+class FailingAudio(discord.AudioSource):
+    """Stands in for an FFmpeg source whose process exited with an error"""
+
+    def __init__(self, error: Exception):
+        self._current_error = error
+
+    def read(self) -> bytes:
+        return b''
+
+class FakeTrackSource(discord.PCMVolumeTransformer):
+    duration = 0
+    position = 0.0
+    interrupted = False
+
+class FakeVoiceClient:
+    ws = SimpleNamespace(speak=lambda state: None)
+    client = SimpleNamespace(loop=None)
+
+    def send_audio_packet(self, data, *, encode=True):
+        pass
+
+    def is_connected(self) -> bool:
+        return False
+
+def play(source: discord.AudioSource) -> list:
+    errors = []
+    done = threading.Event()
+
+    def after(error):
+        errors.append(error)
+        done.set()
+
+    AudioPlayer(source, FakeVoiceClient(), after=after).start()
+    assert done.wait(5)
+    return errors
+
+def gapless(source: discord.AudioSource) -> GaplessSource:
+    return GaplessSource(source, lead=1.0, on_near_end=lambda: None, on_advance=lambda previous, current: None)
+
+def test_inner_source_error_reaches_after():
+    error = RuntimeError('ffmpeg exited with 1')
+    assert play(gapless(FakeTrackSource(FailingAudio(error)))) == [error]
+
+def test_clean_finish_reports_no_error():
+    assert play(gapless(FakeTrackSource(FailingAudio(None)))) == [None]
@@ -14,4 +14,14 @@ class VoiceError(MusicBotError):
 
 class QueueError(MusicBotError):
     """Queue operation errors"""
-    pass
\ No newline at end of file
+    pass
+
+class SpotifyAPIError(MusicBotError):
+    """Spotify Web API errors"""
+    def __init__(self, status: int, message: str):
+        super().__init__(f"Spotify API error {status}: {message}")
+        self.status = status
+
+class SchedulerOverloadedError(YTDLError):
+    """Too many yt-dlp jobs are waiting; the request was turned away"""
+    pass